@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Check that scroll-wheel bursts are applied in full.
+
+Starts one ``volume``/``seek`` invocation per notch, a fixed interval
+apart, like Waybar does during a long wheel flick, against the fake
+playerctl in this directory (see fake_playerctl.py) placed first on
+PATH. The deltas sent by the coalescing leader are summed from the call
+log and compared with the notches given; every invocation must succeed.
+The fake playerctl answers slowly, so a burst outlasts the per-tick time
+budget.
+
+Usage:
+    python benchmarks/adjust.py [--notches 61] [--interval 0.05]
+                                [--latency 0.2]
+
+Exits with status 1 if a check fails.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from run import _MAIN_SNIPPET, make_fake_env
+
+# (subcommand, delta per notch, playerctl command, scale of its argument)
+CASES = [
+    ("volume", 1, "volume", 0.01),
+    ("seek", -2, "position", 1.0),
+]
+
+
+def _applied(log: str, command: str, scale: float) -> tuple[float, int]:
+    """Return the summed delta sent with ``command`` and the number of calls."""
+    total, calls = 0.0, 0
+    with open(log) as f:
+        for line in f:
+            args = line.split()
+            if command not in args[:-1] or args.index(command) != len(args) - 2:
+                continue
+            value = args[-1]
+            total += float(value[:-1]) / scale * (1 if value.endswith("+") else -1)
+            calls += 1
+    return total, calls
+
+
+def run(kind: str, step: int, command: str, scale: float, notches: int, interval: float, latency: float) -> list[str]:
+    """Send one burst; return the problems found."""
+    with tempfile.TemporaryDirectory(prefix="mpris-adjust-") as workdir:
+        env = make_fake_env(workdir, 2, latency, cache_ttl=0)
+        procs = []
+        start = time.perf_counter()
+        for _ in range(notches):
+            procs.append(subprocess.Popen([sys.executable, "-c", _MAIN_SNIPPET, kind, f"{step:+d}"], env=env))
+            time.sleep(interval)
+        failed = sum(1 for proc in procs if proc.wait() != 0)
+        elapsed = time.perf_counter() - start
+        applied, calls = _applied(env["FAKE_PLAYERCTL_LOG"], command, scale)
+
+    expected = step * notches
+    problems = []
+    if abs(applied - expected) > 1e-6:
+        problems.append(f"{kind}: applied {applied:g}, expected {expected:g}")
+    if failed:
+        problems.append(f"{kind}: {failed} invocation(s) failed")
+    status = "ok" if not problems else "FAIL"
+    print(f"{kind:<7} {notches:>7} {calls:>5} {applied:>8g} {elapsed:>8.1f}  {status}")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check coalesced scroll-wheel bursts")
+    parser.add_argument("--notches", type=int, default=61, help="Notches per burst (default: 61)")
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between notches (default: 0.05)")
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake playerctl latency in seconds (default: 0.2)")
+    args = parser.parse_args()
+
+    os.environ.pop("MPRIS_ENHANCED_BUDGET", None)
+    print(f"{'kind':<7} {'notches':>7} {'calls':>5} {'applied':>8} {'time_s':>8}  status")
+    problems = []
+    for kind, step, command, scale in CASES:
+        problems += run(kind, step, command, scale, args.notches, args.interval, args.latency)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
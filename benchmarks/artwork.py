@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Correctness and timing check for the cover art thumbnail cache.
+
+Against temporary cover files and a local HTTP stand-in for remote art
+servers, verifies that:
+
+  * a thumbnail is generated once per cover and then served from disk,
+  * a changed cover file gets a new thumbnail,
+  * the cache stays within its byte budget, evicting least recently
+    used thumbnails first,
+  * remote covers are never requested unless enabled, and are
+    downloaded once when they are,
+
+and measures the cost of a cache hit. Covers are real images when
+Pillow is installed, otherwise opaque bytes cached unscaled.
+
+Usage:
+    python benchmarks/artwork.py [--number 2000]
+
+Exits with status 1 if a check fails.
+"""
+
+import argparse
+import http.server
+import os
+import sys
+import tempfile
+import threading
+import time
+import timeit
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, REPO_DIR)
+
+from mpris_enhanced.artwork import ThumbnailCache, _load_pillow  # noqa: E402
+
+# Larger than the file system's timestamp granularity, so that access
+# order is visible in modification times
+_MTIME_STEP = 0.05
+
+
+def make_cover(path: str, seed: int, side: int = 600) -> None:
+    """Write a cover image (or stand-in bytes without Pillow)."""
+    image = _load_pillow()
+    if image is None:
+        data = bytes((seed + i) % 251 for i in range(side * 20))
+        with open(path, "wb") as f:
+            f.write(data)
+        return
+    image.new("RGB", (side, side), ((seed * 40) % 256, 80, 160)).save(path, "JPEG")
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    """HTTP stand-in serving files from a directory and counting requests."""
+
+    def __init__(self, directory: str) -> None:
+        self.requests = 0
+        handler = type(
+            "Handler",
+            (http.server.SimpleHTTPRequestHandler,),
+            {"log_message": lambda *_: None},
+        )
+        super().__init__(("127.0.0.1", 0), lambda *a: self._count(handler, directory, *a))
+
+    def _count(self, handler, directory, *args):
+        self.requests += 1
+        return handler(*args, directory=directory)
+
+
+def check(workdir: str) -> list[str]:
+    """Return the problems found."""
+    problems = []
+    covers = os.path.join(workdir, "covers")
+    os.makedirs(covers)
+    for i in range(6):
+        make_cover(os.path.join(covers, f"{i}.jpg"), i)
+    url = f"file://{covers}/0.jpg"
+
+    cache = ThumbnailCache(os.path.join(workdir, "thumbs"), size=64)
+    scaled = []
+    scale = cache._scale
+    cache._scale = lambda data: scaled.append(1) or scale(data)
+
+    first = cache.get(url)
+    second = cache.get(url)
+    if first is None or not os.path.exists(first):
+        problems.append("file:// cover not cached")
+    if first != second or len(scaled) != 1:
+        problems.append(f"cover scaled {len(scaled)} times for two lookups")
+
+    make_cover(os.path.join(covers, "0.jpg"), 9)
+    os.utime(os.path.join(covers, "0.jpg"), ns=(1, 1))
+    if cache.get(url) in (None, first):
+        problems.append("changed cover file reused the old thumbnail")
+
+    entry = os.path.getsize(first) if first else 1
+    small = ThumbnailCache(os.path.join(workdir, "small"), size=64, max_bytes=int(entry * 3.5))
+    paths = []
+    for i in (1, 2, 3):
+        paths.append(small.get(f"file://{covers}/{i}.jpg"))
+        time.sleep(_MTIME_STEP)
+    small.get(f"file://{covers}/1.jpg")  # 1 is now more recent than 2 and 3
+    for i in (4, 5):
+        time.sleep(_MTIME_STEP)
+        small.get(f"file://{covers}/{i}.jpg")
+    total = sum(e.stat().st_size for e in os.scandir(small.directory))
+    if total > small.max_bytes:
+        problems.append(f"cache holds {total} bytes, budget {small.max_bytes}")
+    if not os.path.exists(paths[0]) or os.path.exists(paths[1]):
+        problems.append("eviction did not remove the least recently used thumbnail")
+
+    server = _Server(covers)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    remote_url = f"http://127.0.0.1:{server.server_address[1]}/1.jpg"
+    try:
+        if cache.get(remote_url) is not None or server.requests:
+            problems.append("remote cover fetched while remote covers are disabled")
+        remote = ThumbnailCache(os.path.join(workdir, "remote"), size=64, allow_remote=True)
+        if remote.get(remote_url) is None or remote.get(remote_url) is None:
+            problems.append("remote cover not cached")
+        if server.requests != 1:
+            problems.append(f"remote cover requested {server.requests} times")
+        if remote.get(remote_url.replace("1.jpg", "missing.jpg")) is not None:
+            problems.append("missing remote cover produced a thumbnail")
+    finally:
+        server.shutdown()
+        server.server_close()
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check the cover art thumbnail cache")
+    parser.add_argument("--number", type=int, default=2000, help="Lookups per timing (default: 2000)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="mpris-artwork-") as workdir:
+        problems = check(workdir)
+
+        cache = ThumbnailCache(os.path.join(workdir, "timing"), size=64)
+        url = f"file://{workdir}/covers/2.jpg"
+        cache.get(url)
+        seconds = timeit.timeit(lambda: cache.get(url), number=args.number)
+
+    print(f"Pillow: {'yes' if _load_pillow() else 'no (covers cached unscaled)'}")
+    print(f"cache hit: {seconds / args.number * 1e6:.1f} µs")
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Check how many playerctl calls each entry point makes.
+
+Runs a fixed sequence of invocations, each in a fresh interpreter like a
+Waybar tick, against the fake playerctl in this directory (see
+fake_playerctl.py) placed first on PATH, and compares the number of
+playerctl calls in its call log with the expected count. The counts
+must not depend on the number of players.
+
+Usage:
+    python benchmarks/calls.py [--players 1,4,16]
+
+Exits with status 1 if any count differs.
+"""
+
+import argparse
+import sys
+import tempfile
+
+from run import _CALL_SNIPPET, _MAIN_SNIPPET, make_fake_env, measure
+
+# (label, command, snapshot cache TTL, expected playerctl calls), run in
+# order against the same state directories
+STEPS = [
+    ("get_player_info", [_CALL_SNIPPET, "get_player_info"], 0, 1),
+    ("get_player_info", [_CALL_SNIPPET, "get_player_info"], 0, 1),
+    ("get_all_players", [_CALL_SNIPPET, "get_all_players"], 0, 1),
+    ("select_best_player", [_CALL_SNIPPET, "select_best_player"], 0, 1),
+    ("collect_players_async", [_CALL_SNIPPET, "collect_players_async"], 0, 1),
+    ("main info", [_MAIN_SNIPPET, "info"], 0, 1),
+    ("main players", [_MAIN_SNIPPET, "players"], 0, 1),
+    # The position comes with the batched query
+    ("main progress (cold)", [_MAIN_SNIPPET, "progress"], 0, 1),
+    ("main progress", [_MAIN_SNIPPET, "progress"], 0, 1),
+    # Within the snapshot TTL invocations share the collected state
+    ("main info (snapshot)", [_MAIN_SNIPPET, "info"], 30, 1),
+    ("main info (shared)", [_MAIN_SNIPPET, "info"], 30, 0),
+    ("main play (shared)", [_MAIN_SNIPPET, "play"], 30, 0),
+]
+
+
+def run(players: int) -> list[str]:
+    """Run every step with ``players`` fake players; return the failures."""
+    failures = []
+    with tempfile.TemporaryDirectory(prefix="mpris-calls-") as workdir:
+        env = make_fake_env(workdir, players, 0, cache_ttl=0)
+        for label, argv, ttl, expected in STEPS:
+            env["MPRIS_ENHANCED_CACHE_TTL"] = str(ttl)
+            calls = measure([sys.executable, "-c", *argv], env)["subprocesses"]
+            status = "ok" if calls == expected else f"FAIL: expected {expected}"
+            print(f"{players:>7} {label:<26} {calls:>5}  {status}")
+            if calls != expected:
+                failures.append(f"{label} with {players} players")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Count playerctl calls per invocation")
+    parser.add_argument("--players", default="1,4,16", help="Comma-separated player counts (default: 1,4,16)")
+    args = parser.parse_args()
+
+    print(f"{'players':>7} {'step':<26} {'calls':>5}  status")
+    failures = []
+    for players in (int(n) for n in args.players.split(",")):
+        failures += run(players)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Scriptable stand-in for playerctl used by the benchmarks.
+
+Simulates a configurable number of MPRIS players and understands the
+subset of the playerctl command line used by mpris_enhanced. Behaviour
+is controlled through environment variables:
+
+    FAKE_PLAYERCTL_PLAYERS   Number of players (default: 3)
+    FAKE_PLAYERCTL_LATENCY   Seconds to sleep per invocation (default: 0)
+    FAKE_PLAYERCTL_LOG       File to append one line per invocation to
+    FAKE_PLAYERCTL_CHURN     Seconds between simulated changes (default: 0,
+                             no churn). Every period the next player starts
+                             playing a new track and the previous one pauses.
+    FAKE_PLAYERCTL_EPOCH     Start time of the churn schedule (default: 0),
+                             so that runs with the same clock are identical
+    FAKE_PLAYERCTL_HANG      Comma-separated players whose queries never
+                             answer (like a wedged browser tab)
+    FAKE_PLAYERCTL_CRASH     Comma-separated players whose queries make
+                             playerctl abort
+
+Queries that touch a hung or crashing player behave like real playerctl:
+``--all-players`` calls hang or crash as a whole. With ``--follow`` the
+fake keeps running and prints a line whenever the output changes.
+"""
+
+import os
+import re
+import signal
+import sys
+import time
+
+_NAMES = ("spotify", "vlc", "mpv")
+_TEMPLATE_RE = re.compile(r"\{\{\s*([\w:]+)\s*\}\}")
+_ALIASES = {"title": "xesam:title", "artist": "xesam:artist", "album": "xesam:album"}
+
+
+# Seconds between output checks in --follow mode
+_FOLLOW_STEP = 0.05
+
+
+def _churn_step() -> int:
+    """Return how many churn periods have passed (0 without churn)."""
+    period = float(os.environ.get("FAKE_PLAYERCTL_CHURN", "0"))
+    if period <= 0:
+        return 0
+    return int((time.time() - float(os.environ.get("FAKE_PLAYERCTL_EPOCH", "0"))) // period)
+
+
+def make_players(count: int, step: int = 0) -> list[dict[str, str]]:
+    """Return ``count`` deterministic players at a churn step.
+
+    At step 0 the first player is playing; every step the next player
+    starts playing a new track and the others are paused.
+    """
+    players = []
+    playing = step % count if count else 0
+    for i in range(count):
+        name = _NAMES[i] if i < len(_NAMES) else f"chromium.instance{1000 + i}"
+        # Player i started playing at steps i, i + count, ... (step 0 excluded)
+        track = i + count * len(range(i or count, step + 1, count))
+        players.append(
+            {
+                "playerInstance": name,
+                "playerName": name.split(".")[0],
+                "status": "Playing" if i == playing else "Paused",
+                "xesam:title": f"Track {track} title that is long enough to scroll",
+                "xesam:artist": f"Artist {i}",
+                "xesam:album": f"Album {i}",
+                "mpris:trackid": f"/org/fake/track/{track}",
+                "mpris:length": str(180_000_000 + i),
+                "mpris:artUrl": "",
+                "position": str(30_000_000),
+                "volume": "0.500000",
+            }
+        )
+    return players
+
+
+def render(template: str, player: dict[str, str]) -> str:
+    """Expand ``{{field}}`` placeholders like playerctl does."""
+    return _TEMPLATE_RE.sub(lambda m: player.get(_ALIASES.get(m.group(1), m.group(1)), ""), template)
+
+
+def _names(variable: str) -> set[str]:
+    return {name for name in os.environ.get(variable, "").split(",") if name}
+
+
+def main(argv: list[str]) -> int:
+    log = os.environ.get("FAKE_PLAYERCTL_LOG")
+    if log:
+        with open(log, "a") as f:
+            f.write("playerctl " + " ".join(argv) + "\n")
+    time.sleep(float(os.environ.get("FAKE_PLAYERCTL_LATENCY", "0")))
+
+    count = int(os.environ.get("FAKE_PLAYERCTL_PLAYERS", "3"))
+    players = make_players(count, _churn_step())
+    selected = None
+    all_players = False
+    follow = False
+    fmt = None
+    command = []
+    args = iter(argv)
+    for arg in args:
+        if arg in ("-p", "--player"):
+            selected = next(args, "").split(",")
+        elif arg.startswith("--player="):
+            selected = arg.split("=", 1)[1].split(",")
+        elif arg in ("-i", "--ignore-player"):
+            ignored = set(next(args, "").split(","))
+            players = [p for p in players if p["playerInstance"] not in ignored]
+        elif arg.startswith("--ignore-player="):
+            ignored = set(arg.split("=", 1)[1].split(","))
+            players = [p for p in players if p["playerInstance"] not in ignored]
+        elif arg in ("-a", "--all-players"):
+            all_players = True
+        elif arg in ("-f", "--format"):
+            fmt = next(args, "")
+        elif arg in ("-l", "--list-all"):
+            command = ["list"]
+        elif arg in ("-F", "--follow"):
+            follow = True
+        else:
+            command.append(arg)
+
+    if command == ["list"]:
+        print("\n".join(p["playerInstance"] for p in players))
+        return 0 if players else 1
+
+    if selected is not None:
+        players = [p for p in players if p["playerInstance"] in selected or p["playerName"] in selected]
+    if not all_players:
+        players = players[:1]
+    if not players or not command:
+        print("No players found", file=sys.stderr)
+        return 1
+
+    touched = {p["playerInstance"] for p in players}
+    if touched & _names("FAKE_PLAYERCTL_HANG"):
+        signal.pause()
+    if touched & _names("FAKE_PLAYERCTL_CRASH"):
+        os.abort()
+
+    if follow:
+        return _follow(players, command, fmt, count)
+    return _run(players, command, fmt)
+
+
+def _follow(players: list[dict[str, str]], command: list[str], fmt: str | None, count: int) -> int:
+    """Print the command's output, then again whenever it changes."""
+    names = [p["playerInstance"] for p in players]
+    last = None
+    try:
+        while True:
+            current = [p for p in make_players(count, _churn_step()) if p["playerInstance"] in names]
+            lines = [render(fmt, p) for p in current] if fmt is not None else [p["status"] for p in current]
+            if lines != last:
+                print("\n".join(lines), flush=True)
+                last = lines
+            time.sleep(_FOLLOW_STEP)
+    except (BrokenPipeError, KeyboardInterrupt):
+        return 0
+
+
+def _run(players: list[dict[str, str]], command: list[str], fmt: str | None) -> int:
+    """Execute one non-follow command for the selected players."""
+    name, rest = command[0], command[1:]
+    for player in players:
+        if name == "status":
+            print(player["status"])
+        elif name == "metadata":
+            if fmt is not None:
+                print(render(fmt, player))
+            elif rest:
+                print(player.get(_ALIASES.get(rest[0], rest[0]), ""))
+            else:
+                for key, value in player.items():
+                    if ":" in key:
+                        print(f"{player['playerName']} {key} {value}")
+        elif name == "position":
+            if not rest:
+                print(f"{int(player['position']) / 1_000_000:.6f}")
+        elif name == "volume":
+            if not rest:
+                print(player["volume"])
+        elif name not in ("play", "pause", "play-pause", "stop", "next", "previous"):
+            print(f"Command not recognized: {name}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
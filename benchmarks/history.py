@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Correctness and timing check for the listening history log.
+
+Verifies on a short scripted session that starts and stops are recorded
+only on changes, that pausing and resuming a track is one play, and
+that playback time per player adds up. Then writes a synthetic year of
+history (``--per-day`` tracks a day across a few players) through the
+rotating log and times the ``history`` queries against ``--budget-ms``.
+
+Usage:
+    python benchmarks/history.py [--per-day 120] [--budget-ms 1000]
+
+Exits with status 1 if a check fails or a query is over budget.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, REPO_DIR)
+
+from mpris_enhanced import history  # noqa: E402
+
+_DAY = 86400
+
+
+def _state(player: str, status: str, artist: str = "", title: str = "") -> dict:
+    return {"player": player, "status": status, "artist": artist, "title": title}
+
+
+def check(workdir: str) -> list[str]:
+    """Return the problems found in a scripted session."""
+    problems = []
+    os.environ["XDG_STATE_HOME"] = workdir
+    history.enable(True)
+    t0 = 1_700_000_000
+    session = [
+        [],
+        [_state("spotify", "playing", "A", "One")],
+        [_state("spotify", "playing", "A", "One")],  # unchanged
+        [_state("spotify", "paused", "A", "One")],
+        [_state("spotify", "playing", "A", "One")],  # resumed: same play
+        [_state("spotify", "playing", "B", "Two"), _state("mpv", "playing", "A", "Three")],
+        [_state("spotify", "unknown"), _state("mpv", "stopped", "A", "Three")],
+        [_state("spotify", "stopped", "B", "Two")],
+    ]
+    real_time = history.time.time
+    try:
+        for i, (previous, current) in enumerate(zip(session, session[1:])):
+            history.time.time = lambda i=i: t0 + 60 * i
+            history.record_change(previous, current)
+    finally:
+        history.time.time = real_time
+    lines = len(history._pending)
+    history.flush()
+    if lines != 8:
+        problems.append(f"{lines} events recorded for 8 changes")
+
+    log = history.get_log()
+    artists = history.top_artists(log, t0, 10)
+    if artists != [("A", 2), ("B", 1)]:
+        problems.append(f"top artists {artists}")
+    players = dict(history.player_time(log, t0, now=t0 + 600))
+    if players != {"spotify": 300.0, "mpv": 60.0}:
+        problems.append(f"time per player {players}")
+    tracks = [title for _, _, _, title in history.last_tracks(log, 3)]
+    if tracks != ["Three", "Two", "One"]:
+        problems.append(f"last tracks {tracks}")
+    return problems
+
+
+def write_year(log: history.HistoryLog, per_day: int, now: float) -> int:
+    """Write a synthetic year of starts and stops; return the event count."""
+    rng = random.Random(0)
+    players = ["spotify", "mpv", "firefox.instance1", "chromium.instance2"]
+    artists = [f"Artist {i}" for i in range(400)]
+    ts = now - 365 * _DAY
+    step = _DAY / per_day
+    batch = []
+    count = 0
+    while ts < now:
+        player = rng.choice(players)
+        artist = rng.choice(artists)
+        batch.append(f"{int(ts)}\t+\t{player}\t{artist}\tSome fairly typical track title {count}\n")
+        batch.append(f"{int(ts + step * 0.8)}\t-\t{player}\n")
+        count += 2
+        if len(batch) >= 512:
+            log.append(batch)
+            batch = []
+        ts += step
+    if batch:
+        log.append(batch)
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check the listening history log")
+    parser.add_argument("--per-day", type=int, default=120, help="Synthetic tracks per day (default: 120)")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="Maximum time per query (default: 1000)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="mpris-history-") as workdir:
+        problems = check(os.path.join(workdir, "session"))
+
+        log = history.HistoryLog(os.path.join(workdir, "year"))
+        now = time.time()
+        events = write_year(log, args.per_day, now)
+        size = sum(os.path.getsize(p) for p in log.segments())
+        print(f"{events} events in {len(log.segments())} segments ({size / 1e6:.1f} MB)")
+
+        queries = [
+            ("top artists, 7 days", lambda: history.top_artists(log, now - 7 * _DAY)),
+            ("time per player, 7 days", lambda: history.player_time(log, now - 7 * _DAY, now)),
+            ("time per player, 365 days", lambda: history.player_time(log, now - 365 * _DAY, now)),
+            ("last 20 tracks", lambda: history.last_tracks(log, 20)),
+        ]
+        print(f"{'query':<28} {'ms':>8}  status")
+        for name, query in queries:
+            start = time.perf_counter()
+            rows = query()
+            ms = (time.perf_counter() - start) * 1000
+            status = "ok"
+            if not rows:
+                status = "FAIL: no rows"
+            elif ms > args.budget_ms:
+                status = f"FAIL: over budget ({args.budget_ms:.0f} ms)"
+            problems += [] if status == "ok" else [name]
+            print(f"{name:<28} {ms:>8.1f}  {status}")
+
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
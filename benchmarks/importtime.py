@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Import-time regression check for the per-tick entry path.
+
+Runs the ``mpris_enhanced.py`` entry point, as Waybar does, for every
+component in a fresh interpreter under ``python -X importtime`` (with the
+in-process fake backend and no server running, so no playerctl is
+needed) and fails if:
+
+  * a module that the fast path must not load is imported (argparse,
+    tempfile, subprocess, ... or another component's module), or
+  * the median total self time of the modules imported after
+    interpreter startup exceeds the budget.
+
+Usage:
+    python benchmarks/importtime.py [--budget-ms 50] [--repeat 5] [--verbose]
+
+Exits with status 1 if any component is over budget.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, REPO_DIR)
+
+from mpris_enhanced.main import COMPONENTS  # noqa: E402
+
+# Never needed to render a component from a fresh or cached snapshot.
+FORBIDDEN = {"argparse", "tempfile", "subprocess", "hashlib", "socket", "selectors", "socketserver"}
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+\d+ \|(\s*)(\S+)$")
+
+ENTRY_POINT = os.path.join(REPO_DIR, "mpris_enhanced.py")
+
+
+def import_profile(cmd: list[str], env: dict[str, str]) -> dict[str, int]:
+    """Run a command under ``-X importtime`` and return {module: self µs}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *cmd],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            modules[match.group(3)] = int(match.group(1))
+    return modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check the import budget of the per-tick entry path")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="Maximum median import time per component (default: 50)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per component (default: 5)")
+    parser.add_argument("--verbose", action="store_true", help="List the slowest imported modules")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="mpris-importtime-") as workdir:
+        env = dict(os.environ)
+        env.update(
+            PYTHONPATH=REPO_DIR,
+            MPRIS_ENHANCED_BACKEND="fake",
+            MPRIS_ENHANCED_FAKE_PLAYERS='[{"player": "spotify", "title": "Title", "artist": "Artist", "status": "playing"}]',
+            XDG_RUNTIME_DIR=workdir,
+            XDG_STATE_HOME=workdir,
+            XDG_CACHE_HOME=workdir,
+        )
+        env.pop("MPRIS_ENHANCED_METRICS", None)
+        startup = set(import_profile(["-c", "pass"], env))
+
+        failed = False
+        print(f"{'component':<14} {'median ms':>10}  status")
+        for name, (module, _) in COMPONENTS.items():
+            cmd = [ENTRY_POINT, name]
+            runs = [import_profile(cmd, env) for _ in range(args.repeat)]
+            totals = [sum(us for mod, us in run.items() if mod not in startup) for run in runs]
+            median_ms = statistics.median(totals) / 1000
+
+            loaded = set(runs[-1])
+            problems = sorted(loaded & FORBIDDEN)
+            problems += sorted(
+                m for m in loaded if m.startswith("mpris_enhanced.components.") and m.split(".")[-1] not in ("base", module)
+            )
+            if median_ms > args.budget_ms:
+                problems.append(f"over budget ({args.budget_ms:.0f} ms)")
+
+            failed |= bool(problems)
+            print(f"{name:<14} {median_ms:>10.1f}  {'FAIL: ' + ', '.join(problems) if problems else 'ok'}")
+            if args.verbose:
+                slowest = sorted(((us, m) for m, us in runs[-1].items() if m not in startup), reverse=True)[:8]
+                for us, mod in slowest:
+                    print(f"    {us / 1000:>7.2f} ms  {mod}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of the per-frame render cost in resident modes.
+
+For every component, measures one frame rendered and encoded from
+scratch (``render()`` + ``json.dumps``) against one frame served by
+``RenderCache`` from an unchanged player state, plus ``escape_pango`` on
+a typical title. State files go to a temporary runtime directory.
+
+Usage:
+    python benchmarks/render.py [--number 20000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, REPO_DIR)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the per-frame render cost")
+    parser.add_argument("--number", type=int, default=20000, help="Frames per measurement (default: 20000)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="mpris-render-") as workdir:
+        os.environ["XDG_RUNTIME_DIR"] = workdir
+
+        from mpris_enhanced.components.base import ComponentArgs
+        from mpris_enhanced.main import COMPONENTS, load_component
+        from mpris_enhanced.playerctl import PlayerInfo, set_backend
+        from mpris_enhanced.render import RenderCache, encode_output
+        from mpris_enhanced.utils import escape_pango
+
+        set_backend("fake")
+        # Paused, so the scroll position and progress frame stay put
+        info = PlayerInfo(
+            player="spotify",
+            title="A <rather> long title & one that scrolls",
+            artist="Artist's \"Name\"",
+            status="paused",
+            length=180.0,
+            position=42.0,
+        )
+
+        cases = [(name, ComponentArgs()) for name in COMPONENTS]
+        cases.append(("info --scroll", ComponentArgs(scroll=True)))
+
+        print(f"{'component':<16} {'uncached µs':>12} {'cached µs':>10} {'speedup':>8}")
+        for name, component_args in cases:
+            component = load_component(name.split()[0])(component_args)
+            cache = RenderCache()
+            uncached = timeit.timeit(lambda c=component: encode_output(c.render(info)), number=args.number)
+            cached = timeit.timeit(lambda c=component, rc=cache: rc.render(c, info), number=args.number)
+            print(
+                f"{name:<16} {uncached / args.number * 1e6:>12.2f} {cached / args.number * 1e6:>10.2f}"
+                f" {uncached / cached:>7.1f}x"
+            )
+
+        seconds = timeit.timeit(lambda: escape_pango(info.title), number=args.number)
+        print(f"\nescape_pango: {seconds / args.number * 1e6:.3f} µs per title")
+
+
+if __name__ == "__main__":
+    main()
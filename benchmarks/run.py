@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Benchmark the per-tick cost of mpris_enhanced.
+
+Every case runs in a fresh interpreter, exactly like a Waybar tick,
+against the fake playerctl in this directory (see fake_playerctl.py)
+placed first on PATH. For each case the wall time, CPU time (including
+child processes), number of spawned subprocesses and peak RSS are
+recorded, and a JSON report is written so runs can be compared.
+
+Usage:
+    python benchmarks/run.py [--players 1,4,16] [--latency 0.005]
+                             [--repeat 10] [--output report.json]
+                             [--compare baseline.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+sys.path.insert(0, REPO_DIR)
+
+from mpris_enhanced import __version__  # noqa: E402
+from mpris_enhanced.main import COMPONENTS  # noqa: E402
+
+# Runs one library call in the child and prints its own wall/CPU time,
+# so that interpreter startup and imports are excluded. Coroutine
+# functions are run in a fresh event loop.
+_CALL_SNIPPET = """
+import json, sys, time
+from mpris_enhanced import playerctl
+func = getattr(playerctl, sys.argv[1])
+wall, cpu = time.perf_counter(), time.process_time()
+result = func()
+if hasattr(result, "__await__"):
+    import asyncio
+    asyncio.run(result)
+print(json.dumps({"wall": time.perf_counter() - wall, "cpu": time.process_time() - cpu}))
+"""
+
+_MAIN_SNIPPET = "import sys; from mpris_enhanced.main import main; main()"
+
+
+def _write_executable(path: str, content: str) -> None:
+    with open(path, "w") as f:
+        f.write(content)
+    os.chmod(path, 0o755)
+
+
+def make_fake_env(workdir: str, players: int, latency: float, cache_ttl: float) -> dict[str, str]:
+    """Create a bin directory with fake playerctl/walker and return the env.
+
+    All state directories point into ``workdir`` so runs never touch the
+    user's real pin, cache or runtime files.
+    """
+    bin_dir = os.path.join(workdir, "bin")
+    os.makedirs(bin_dir, exist_ok=True)
+    log = os.path.join(workdir, "calls.log")
+    fake = os.path.join(BENCH_DIR, "fake_playerctl.py")
+    _write_executable(
+        os.path.join(bin_dir, "playerctl"),
+        f"#!/bin/sh\nexec {shlex.quote(sys.executable)} {shlex.quote(fake)} \"$@\"\n",
+    )
+    # walker is stubbed: log the call, consume the menu and pick entry 0
+    _write_executable(
+        os.path.join(bin_dir, "walker"),
+        f"#!/bin/sh\necho \"walker $*\" >> {shlex.quote(log)}\ncat > /dev/null\necho 0\n",
+    )
+
+    env = dict(os.environ)
+    for name in ("XDG_RUNTIME_DIR", "XDG_CACHE_HOME", "XDG_STATE_HOME", "XDG_CONFIG_HOME"):
+        env[name] = os.path.join(workdir, name.lower())
+        os.makedirs(env[name], mode=0o700, exist_ok=True)
+    env.update(
+        PATH=bin_dir + os.pathsep + env.get("PATH", ""),
+        PYTHONPATH=REPO_DIR,
+        FAKE_PLAYERCTL_PLAYERS=str(players),
+        FAKE_PLAYERCTL_LATENCY=str(latency),
+        FAKE_PLAYERCTL_LOG=log,
+        MPRIS_ENHANCED_CACHE_TTL=str(cache_ttl),
+    )
+    env.pop("MPRIS_ENHANCED_BACKEND", None)
+    return env
+
+
+def _count_calls(log: str) -> int:
+    try:
+        with open(log) as f:
+            return sum(1 for _ in f)
+    except FileNotFoundError:
+        return 0
+
+
+def measure(cmd: list[str], env: dict[str, str]) -> dict[str, float]:
+    """Run one command and return its cost.
+
+    CPU time and peak RSS come from ``wait4`` and include the
+    subprocesses the command waited for.
+    """
+    log = env["FAKE_PLAYERCTL_LOG"]
+    calls_before = _count_calls(log)
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    stdout = proc.stdout.read()
+    proc.stdout.close()
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    wall = time.perf_counter() - start
+
+    result = {
+        "wall_ms": wall * 1000,
+        "cpu_ms": (usage.ru_utime + usage.ru_stime) * 1000,
+        "subprocesses": _count_calls(log) - calls_before,
+        "max_rss_kb": usage.ru_maxrss,
+    }
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)} exited with {proc.returncode}")
+    if cmd[1] == "-c" and cmd[2] == _CALL_SNIPPET:
+        inner = json.loads(stdout)
+        result["call_wall_ms"] = inner["wall"] * 1000
+        result["call_cpu_ms"] = inner["cpu"] * 1000
+    return result
+
+
+def cases() -> list[tuple[str, list[str]]]:
+    """Return (name, command) for every benchmarked entry point."""
+    entries = [(f"main:{name}", [name]) for name in COMPONENTS]
+    entries += [("main:info --scroll", ["info", "--scroll"]), ("main:select-player", ["select-player"]), ("main:pick", ["pick"])]
+    result = [(name, [sys.executable, "-c", _MAIN_SNIPPET, *argv]) for name, argv in entries]
+    for func in ("get_player_info", "get_all_players"):
+        result.append((f"call:{func}", [sys.executable, "-c", _CALL_SNIPPET, func]))
+    return result
+
+
+def summarize(samples: list[dict[str, float]]) -> dict[str, dict[str, float]]:
+    """Aggregate repeated samples into min/median/mean/max per metric."""
+    summary = {}
+    for metric in samples[0]:
+        values = [s[metric] for s in samples]
+        summary[metric] = {
+            "min": min(values),
+            "median": statistics.median(values),
+            "mean": statistics.fmean(values),
+            "max": max(values),
+        }
+    return summary
+
+
+def run(player_counts: list[int], latency: float, repeat: int, cache_ttl: float) -> dict:
+    """Run every case for every player count and return the report."""
+    results = []
+    for players in player_counts:
+        with tempfile.TemporaryDirectory(prefix="mpris-bench-") as workdir:
+            env = make_fake_env(workdir, players, latency, cache_ttl)
+            for name, cmd in cases():
+                measure(cmd, env)  # warm up page cache and bytecode
+                samples = [measure(cmd, env) for _ in range(repeat)]
+                results.append({"case": name, "players": players, **summarize(samples)})
+
+    return {
+        "meta": {
+            "version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "latency_s": latency,
+            "repeat": repeat,
+            "cache_ttl_s": cache_ttl,
+        },
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict) -> None:
+    """Print median wall time and subprocess deltas against a baseline."""
+    base = {(r["case"], r["players"]): r for r in baseline["results"]}
+    print(f"{'case':<28} {'players':>7} {'wall ms':>10} {'Δ wall':>8} {'procs':>6} {'Δ procs':>8}")
+    for r in report["results"]:
+        old = base.get((r["case"], r["players"]))
+        wall = r["wall_ms"]["median"]
+        procs = r["subprocesses"]["median"]
+        d_wall = f"{(wall / old['wall_ms']['median'] - 1) * 100:+.0f}%" if old else "-"
+        d_procs = f"{procs - old['subprocesses']['median']:+.0f}" if old else "-"
+        print(f"{r['case']:<28} {r['players']:>7} {wall:>10.1f} {d_wall:>8} {procs:>6.0f} {d_procs:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the per-tick invocation path")
+    parser.add_argument("--players", default="1,4,16", help="Comma-separated player counts (default: 1,4,16)")
+    parser.add_argument("--latency", type=float, default=0.005, help="Fake playerctl latency per call in seconds")
+    parser.add_argument("--repeat", type=int, default=10, help="Samples per case (default: 10)")
+    parser.add_argument("--cache-ttl", type=float, default=0, help="Snapshot cache TTL; 0 measures uncached ticks")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="Print deltas against an earlier JSON report")
+    args = parser.parse_args()
+
+    report = run([int(n) for n in args.players.split(",")], args.latency, args.repeat, args.cache_ttl)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Scaling and fault-injection test against the fake playerctl.
+
+Drives ``get_player_info()``, ``select_best_player()``,
+``collect_players_async()`` and the picker at 1, 10 and 100 simulated players (see fake_playerctl.py) in several
+scenarios, and checks the scaling curves:
+
+  steady   players never change
+  churn    the playing player and its track change every 200 ms
+  hang     one player never answers
+  crash    queries touching one player abort
+
+In the steady and churn scenarios the number of spawned subprocesses
+must not depend on the player count, and the median wall time at the
+largest count may be at most ``--max-growth`` times the one at the
+smallest. With a hung or crashing player every call must finish within
+the time budget plus ``--slack``, and only the faulty player may be in
+the circuit breaker state afterwards. The snapshot cache is disabled so
+that every call does the full work; the circuit breaker state is kept
+between calls, as it would be between Waybar ticks.
+
+Usage:
+    python benchmarks/scaling.py [--players 1,10,100] [--repeat 5]
+                                 [--latency 0.005] [--output report.json]
+
+Exits with status 1 if a check fails.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+
+from run import _CALL_SNIPPET, _MAIN_SNIPPET, make_fake_env, measure
+
+SCENARIOS = {
+    "steady": {},
+    "churn": {"FAKE_PLAYERCTL_CHURN": "0.2"},
+    "hang": {"FAKE_PLAYERCTL_HANG": "vlc"},
+    "crash": {"FAKE_PLAYERCTL_CRASH": "vlc"},
+}
+
+# Must match the default of MPRIS_ENHANCED_BUDGET
+_BUDGET_S = 2.0
+
+
+def cases() -> list[tuple[str, list[str]]]:
+    """Return (name, command) for every driven entry point."""
+    return [
+        ("get_player_info", [sys.executable, "-c", _CALL_SNIPPET, "get_player_info"]),
+        ("select_best_player", [sys.executable, "-c", _CALL_SNIPPET, "select_best_player"]),
+        ("collect_players_async", [sys.executable, "-c", _CALL_SNIPPET, "collect_players_async"]),
+        ("pick", [sys.executable, "-c", _MAIN_SNIPPET, "pick"]),
+    ]
+
+
+def _blamed(env: dict[str, str], overrides: dict[str, str]) -> list[str]:
+    """Return the healthy players the circuit breaker has counted failures for."""
+    path = os.path.join(env["XDG_RUNTIME_DIR"], "waybar-mpris-enhanced", "breaker.json")
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return []
+    faulty = {overrides.get("FAKE_PLAYERCTL_HANG"), overrides.get("FAKE_PLAYERCTL_CRASH")}
+    return sorted(player for player in state if player not in faulty)
+
+
+def run(player_counts: list[int], latency: float, repeat: int) -> list[dict]:
+    """Measure every case in every scenario; return one row per combination."""
+    rows = []
+    for scenario, overrides in SCENARIOS.items():
+        for players in player_counts:
+            with tempfile.TemporaryDirectory(prefix="mpris-scaling-") as workdir:
+                env = make_fake_env(workdir, players, latency, cache_ttl=0)
+                env.update(overrides, FAKE_PLAYERCTL_EPOCH="0")
+                for name, cmd in cases():
+                    samples = [measure(cmd, env) for _ in range(repeat)]
+                    rows.append(
+                        {
+                            "scenario": scenario,
+                            "case": name,
+                            "players": players,
+                            "wall_ms": statistics.median(s["wall_ms"] for s in samples),
+                            "max_wall_ms": max(s["wall_ms"] for s in samples),
+                            "subprocesses": statistics.median(s["subprocesses"] for s in samples),
+                            "blamed": _blamed(env, overrides),
+                        }
+                    )
+    return rows
+
+
+def check(rows: list[dict], max_growth: float, slack: float) -> list[str]:
+    """Return a description of every failed scaling check."""
+    failures = []
+    by_key = {(r["scenario"], r["case"], r["players"]): r for r in rows}
+    counts = sorted({r["players"] for r in rows})
+    for scenario in SCENARIOS:
+        for name, _ in cases():
+            series = [by_key[(scenario, name, n)] for n in counts]
+            label = f"{scenario}/{name}"
+            if scenario in ("steady", "churn"):
+                spawns = {r["subprocesses"] for r in series}
+                if len(spawns) > 1:
+                    failures.append(f"{label}: subprocesses grow with players ({sorted(spawns)})")
+                growth = series[-1]["wall_ms"] / series[0]["wall_ms"]
+                if growth > max_growth:
+                    failures.append(f"{label}: wall time grows {growth:.1f}x from {counts[0]} to {counts[-1]} players")
+            else:
+                worst = max(r["max_wall_ms"] for r in series)
+                if worst > (_BUDGET_S + slack) * 1000:
+                    failures.append(f"{label}: {worst:.0f} ms exceeds the {_BUDGET_S:.0f} s budget")
+            for r in series:
+                if r["blamed"]:
+                    failures.append(
+                        f"{label}: {len(r['blamed'])} healthy players in the breaker at"
+                        f" {r['players']} players (e.g. {r['blamed'][0]})"
+                    )
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check latency and subprocess scaling against simulated players")
+    parser.add_argument("--players", default="1,10,100", help="Comma-separated player counts (default: 1,10,100)")
+    parser.add_argument("--latency", type=float, default=0.005, help="Fake playerctl latency per call in seconds")
+    parser.add_argument("--repeat", type=int, default=5, help="Samples per case (default: 5)")
+    parser.add_argument("--max-growth", type=float, default=2.0, help="Allowed wall time growth from fewest to most players")
+    parser.add_argument("--slack", type=float, default=1.0, help="Seconds allowed over the time budget (default: 1)")
+    parser.add_argument("--output", help="Also write the rows as JSON to this file")
+    args = parser.parse_args()
+
+    rows = run([int(n) for n in args.players.split(",")], args.latency, args.repeat)
+
+    print(f"{'scenario':<8} {'case':<22} {'players':>7} {'wall ms':>9} {'max ms':>9} {'procs':>6}")
+    for r in rows:
+        print(
+            f"{r['scenario']:<8} {r['case']:<22} {r['players']:>7} {r['wall_ms']:>9.1f}"
+            f" {r['max_wall_ms']:>9.1f} {r['subprocesses']:>6.0f}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+
+    failures = check(rows, args.max_growth, args.slack)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    os.environ.pop("MPRIS_ENHANCED_METRICS", None)
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Check the refresh signals sent to Waybar.
+
+Starts a stand-in process renamed to ``waybar`` (with ``prctl``) that
+records every ``SIGRTMIN+N`` it receives, then drives player changes
+through the fake backend and checks which signals arrive: one per
+configured module on a status or track change, none while the state is
+unchanged, both with and without the snapshot cache, and none at all
+when no signals are configured. A real Waybar of the same user that
+happens to be running receives the same signals, i.e. a few refreshes.
+
+Usage:
+    python benchmarks/signals.py
+
+Exits with status 1 if a check fails.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, REPO_DIR)
+
+from mpris_enhanced import playerctl  # noqa: E402
+from mpris_enhanced.playerctl import FakeBackend, PlayerInfo  # noqa: E402
+from mpris_enhanced.signals import notify_waybar  # noqa: E402
+
+# Renames itself to "waybar", prints "ready" and appends every realtime
+# signal offset it receives to the log given as argv[1].
+_STAND_IN = """
+import ctypes, signal, sys, time
+ctypes.CDLL(None).prctl(15, b"waybar", 0, 0, 0)  # PR_SET_NAME
+log = open(sys.argv[1], "a", buffering=1)
+for n in range(1, signal.SIGRTMAX - signal.SIGRTMIN + 1):
+    signal.signal(signal.SIGRTMIN + n, lambda signum, _: log.write(f"{signum - signal.SIGRTMIN}\\n"))
+print("ready", flush=True)
+while True:
+    time.sleep(1)
+"""
+
+_SIGNALS = "play=8,info=9"
+
+
+def _received(log: str) -> list[int]:
+    # Delivery is asynchronous; give the stand-in a moment to log
+    time.sleep(0.2)
+    with open(log) as f:
+        offsets = [int(line) for line in f]
+    open(log, "w").close()
+    return sorted(offsets)
+
+
+def _scenario(cache_ttl: float) -> Iterator[tuple[str, list[int]]]:
+    """Collect a sequence of player states; yield (step, expected offsets)."""
+    spotify = PlayerInfo(player="spotify", title="One", artist="A", status="playing")
+    steps = [
+        ("first collection", [spotify], []),
+        ("unchanged", [spotify], []),
+        ("paused", [PlayerInfo(player="spotify", title="One", artist="A", status="paused")], [8, 9]),
+        ("new track", [PlayerInfo(player="spotify", title="Two", artist="A", status="paused")], [8, 9]),
+        ("unchanged", [PlayerInfo(player="spotify", title="Two", artist="A", status="paused")], []),
+    ]
+    playerctl.set_cache_ttl(cache_ttl)
+    for label, players, expected in steps:
+        playerctl.set_backend(FakeBackend(players))
+        playerctl.collect_players(refresh=True)
+        yield label, expected
+
+
+def check(log: str) -> list[str]:
+    """Return the problems found; the stand-in must be running."""
+    problems = []
+    os.environ["MPRIS_ENHANCED_SIGNALS"] = _SIGNALS
+    if notify_waybar() != 2 or _received(log) != [8, 9]:
+        problems.append("notify_waybar did not reach the stand-in")
+    if notify_waybar(["play"]) != 1 or _received(log) != [8]:
+        problems.append("notify_waybar(['play']) did not send only the play signal")
+
+    for cache_ttl in (0.5, 0):
+        playerctl._has_collected = False
+        for label, expected in _scenario(cache_ttl):
+            received = _received(log)
+            if received != expected:
+                problems.append(f"cache TTL {cache_ttl}, {label}: received {received}, expected {expected}")
+
+    os.environ["MPRIS_ENHANCED_SIGNALS"] = ""
+    if notify_waybar() != 0 or _received(log):
+        problems.append("signals were sent with none configured")
+    return problems
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory(prefix="mpris-signals-") as workdir:
+        os.environ["XDG_RUNTIME_DIR"] = workdir
+        os.environ["XDG_CONFIG_HOME"] = workdir
+        log = os.path.join(workdir, "signals.log")
+        open(log, "w").close()
+        stand_in = subprocess.Popen([sys.executable, "-c", _STAND_IN, log], stdout=subprocess.PIPE)
+        try:
+            stand_in.stdout.readline()
+            problems = check(log)
+        finally:
+            stand_in.kill()
+            stand_in.wait()
+
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    print("ok" if not problems else f"{len(problems)} problem(s)")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
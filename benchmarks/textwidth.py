@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Correctness and per-frame timing check for display-width text handling.
+
+For a set of mixed-script titles (CJK, Hangul, emoji ZWJ sequences,
+flags, combining marks), verifies that:
+
+  * truncated titles fit the display width and end on a grapheme
+    cluster boundary,
+  * every scroll frame has exactly the requested display width and is
+    made of whole clusters,
+
+and measures the cost of one scroll frame with the cached width index.
+
+Usage:
+    python benchmarks/textwidth.py [--max-length 25] [--budget-us 20]
+
+Exits with status 1 if a check fails or a frame is over budget.
+"""
+
+import argparse
+import os
+import sys
+import timeit
+import unicodedata
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, REPO_DIR)
+
+from mpris_enhanced.utils import (  # noqa: E402
+    _SCROLL_SEPARATOR,
+    _text_index,
+    display_width,
+    scroll_window,
+    truncate_text,
+)
+
+# (title, expected display width)
+TITLES = [
+    ("Plain ASCII title that is long enough to scroll", 47),
+    ("東京事変 - 群青日和 (Live at Budokan)", 37),
+    ("한국어 노래 제목입니다 그리고 조금 더 깁니다", 44),
+    ("Family 👨‍👩‍👧‍👦 and flags 🇯🇵🇫🇷 in one title", 37),
+    ("Combining marks: Noe\u0308l, Cafe\u0301 del Mar, Zoe\u0308 (decomposed)", 53),
+    ("Skin tones 👍🏽👋🏿 and presentation ❤️ selectors", 45),
+    ("Mixed Ελληνικά, Русский, हिन्दी गीत, 中文歌曲", 41),
+]
+
+
+def check(title: str, width: int, max_len: int) -> list[str]:
+    """Return the problems found for one title."""
+    problems = []
+    clusters = _text_index(title)[0]
+    boundaries = {len("".join(clusters[:i])) for i in range(len(clusters) + 1)}
+
+    if display_width(title) != width:
+        problems.append(f"width {display_width(title)} != {width}")
+
+    truncated = truncate_text(title, max_len)
+    if display_width(truncated) > max_len:
+        problems.append(f"truncated to {display_width(truncated)} cells")
+    if truncated != title and len(truncated) - 1 not in boundaries:
+        problems.append("truncation splits a grapheme cluster")
+
+    padded_clusters = _text_index(title + _SCROLL_SEPARATOR)[0]
+    for position in range(len(padded_clusters)):
+        frame = scroll_window(title, max_len, position)
+        if display_width(frame) != max_len:
+            problems.append(f"frame {position} is {display_width(frame)} cells")
+            break
+        if unicodedata.category(frame[0]) in ("Mn", "Me", "Mc") or frame[0] in "‍️":
+            problems.append(f"frame {position} starts inside a cluster")
+            break
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check display-width truncation and scrolling")
+    parser.add_argument("--max-length", type=int, default=25, help="Window width in cells (default: 25)")
+    parser.add_argument("--budget-us", type=float, default=20.0, help="Maximum cost of one scroll frame (default: 20)")
+    parser.add_argument("--number", type=int, default=20000, help="Frames per timing (default: 20000)")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'title':<32} {'cells':>5} {'frame µs':>9}  status")
+    for title, width in TITLES:
+        problems = check(title, width, args.max_length)
+
+        position = len(_text_index(title)[0]) // 2
+        scroll_window(title, args.max_length, position)  # build the index once
+        seconds = timeit.timeit(lambda t=title, p=position: scroll_window(t, args.max_length, p), number=args.number)
+        frame_us = seconds / args.number * 1e6
+        if frame_us > args.budget_us:
+            problems.append(f"over budget ({args.budget_us:.0f} µs)")
+
+        failed |= bool(problems)
+        label = truncate_text(title, 30)
+        label += " " * (30 - display_width(label))
+        print(f"{label}   {width:>5} {frame_us:>9.2f}  {'FAIL: ' + ', '.join(problems) if problems else 'ok'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,10 @@ Enhanced Custom Waybar MPRIS module
 Outputs structured data for use with Waybar's group module
 
 This is a wrapper script that imports from the mpris_enhanced package.
+Requests are forwarded to a running 'serve' instance when available.
 """
 
-from mpris_enhanced.main import main
+from mpris_enhanced.client import main
 
 if __name__ == "__main__":
     main()
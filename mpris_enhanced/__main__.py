@@ -1,6 +1,6 @@
 """Entry point for running the module directly."""
 
-from .main import main
+from .client import main
 
 if __name__ == "__main__":
     main()
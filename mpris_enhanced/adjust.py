@@ -0,0 +1,182 @@
+"""Scroll-wheel volume and seek for MPRIS module.
+
+Implements the ``volume`` and ``seek`` subcommands used by the
+``on-scroll-up``/``on-scroll-down`` handlers. A fast wheel flick makes
+Waybar start one process per notch; instead of each resolving the
+player and calling playerctl, the processes add their delta to a shared
+accumulator file under an ``flock``. The first process of a burst
+becomes the leader: it resolves the target player, waits for the
+coalescing window, then sends the summed delta with a single playerctl
+call. The other processes exit as soon as their delta is recorded.
+Notches arriving while the leader's call runs are sent by the same
+leader in its next round. The delta of a failed call is added to the
+next round too, and only dropped when a retry with no new notches fails.
+"""
+
+__all__ = ["ADJUSTMENTS", "DeltaAccumulator", "run_adjust"]
+
+import fcntl
+import json
+import os
+import time
+
+from .constants import ADJUSTMENTS
+
+# How long the leader collects notches before sending them.
+_COALESCE_WINDOW = 0.08
+# A leader that has not made progress for this long is presumed dead.
+_LEADER_TIMEOUT = 3.0
+
+
+class DeltaAccumulator:
+    """Delta summed across processes in a locked state file.
+
+    Args:
+        path: State file; it is also locked while being updated.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def _update(self, update):
+        """Apply ``update(state) -> result`` to the state under the lock.
+
+        Raises:
+            OSError: If the state file cannot be opened or locked.
+        """
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                state = json.loads(os.read(fd, 4096) or b"{}")
+            except ValueError:
+                state = {}
+            if not isinstance(state, dict):
+                state = {}
+            result = update(state)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, json.dumps(state).encode())
+            return result
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _leader_alive(state: dict, now: float) -> bool:
+        pid = state.get("leader")
+        if not isinstance(pid, int) or now - float(state.get("heartbeat", 0)) > _LEADER_TIMEOUT:
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            pass
+        return True
+
+    def add(self, delta: float) -> bool:
+        """Add a delta; return True if the caller became the leader."""
+
+        def update(state: dict) -> bool:
+            now = time.time()
+            state["delta"] = float(state.get("delta", 0.0)) + delta
+            state["count"] = int(state.get("count", 0)) + 1
+            if self._leader_alive(state, now):
+                return False
+            state.update(leader=os.getpid(), heartbeat=now)
+            return True
+
+        return self._update(update)
+
+    def take(self) -> tuple[float, int]:
+        """Reset the accumulator and return the (delta, notches) it held.
+
+        Only the leader takes deltas. When nothing is pending it gives up
+        leadership, so that the next notch starts a new burst.
+        """
+
+        def update(state: dict) -> tuple[float, int]:
+            if state.get("leader") != os.getpid():
+                return 0.0, 0
+            delta, count = float(state.get("delta", 0.0)), int(state.get("count", 0))
+            state.update(delta=0.0, count=0, heartbeat=time.time())
+            if not count:
+                del state["leader"], state["heartbeat"]
+            return delta, count
+
+        return self._update(update)
+
+
+def _send(player: str, kind: str, delta: float) -> bool:
+    """Send a summed delta to a player with one playerctl call.
+
+    After a seek the progress component's position anchor is dropped, so
+    its next frame reads the new position.
+    """
+    from .playerctl import run_playerctl
+
+    command, scale = ADJUSTMENTS[kind]
+    value = abs(delta) * scale
+    ok = run_playerctl(["--player", player, command, f"{value:g}{'+' if delta > 0 else '-'}"]) is not None
+    if ok and kind == "seek":
+        from .components.progress import get_position_tracker
+
+        get_position_tracker().invalidate()
+    return ok
+
+
+def run_adjust(kind: str, delta: float) -> bool:
+    """Change the current player's volume or position, coalescing bursts.
+
+    Args:
+        kind: Key of ``ADJUSTMENTS``.
+        delta: Volume change in percent, or seek offset in seconds.
+
+    Returns:
+        True if the delta was handed to a leader or every playerctl call
+        the leader made succeeded.
+    """
+    from . import metrics
+    from .control import refresh_shared_state, resolve_target
+    from .utils import get_runtime_dir
+
+    accumulator = DeltaAccumulator(os.path.join(get_runtime_dir(), f"{kind}-delta.json"))
+    try:
+        if not accumulator.add(delta):
+            return True
+    except OSError:
+        # No shared state: send this notch on its own
+        player = resolve_target()
+        return player is not None and _send(player, kind, delta)
+
+    # Resolve the player while the burst is still coming in
+    window_end = time.monotonic() + _COALESCE_WINDOW
+    player = resolve_target()
+    ok = True
+    sent = False
+    # Delta of a failed send, retried with the next round
+    pending = 0.0
+    while True:
+        time.sleep(max(window_end - time.monotonic(), 0))
+        total, count = accumulator.take()
+        if not count and not pending:
+            break
+        window_end = time.monotonic() + _COALESCE_WINDOW
+        if count > 1:
+            metrics.record_event(f"{kind}-coalesced", count - 1)
+        total, pending = total + pending, 0.0
+        if abs(total) < 1e-9:
+            continue
+        if player is None:
+            ok = False
+        elif _send(player, kind, total):
+            sent = True
+        elif count:
+            pending = total
+        else:
+            # Already the retry of a failed send with nothing new to add
+            ok = False
+
+    if sent and kind == "seek":
+        refresh_shared_state()
+    return ok
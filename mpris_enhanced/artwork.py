@@ -0,0 +1,233 @@
+"""Cover art thumbnails for MPRIS module.
+
+Implements the ``cover`` subcommand, meant as the ``exec`` of a Waybar
+``image`` module placed next to the info module (GTK tooltips render
+Pango markup only and cannot show images). It prints the path of a
+thumbnail of the current track's ``mpris:artUrl``, or an empty line to
+hide the image.
+
+Thumbnails live in ``$XDG_CACHE_HOME/waybar-mpris-enhanced/covers``
+and are generated at most once per cover: local files are keyed by URL,
+size and modification time, remote ones by URL. The cache is bounded
+by total size, evicting the least recently used thumbnails first.
+Settings come from the ``"artwork"`` object of the config file::
+
+    {"artwork": {"size": 128, "max_bytes": 4194304, "remote": false}}
+
+Scaling requires Pillow; without it the cover is cached unscaled (the
+image module scales it on display). Remote (``http(s)://``) covers are
+only fetched with ``"remote": true``.
+"""
+
+__all__ = ["ThumbnailCache", "get_thumbnail_cache", "get_cover_path"]
+
+import contextlib
+import os
+
+from .config import load_config
+from .utils import get_cache_dir
+
+_DEFAULT_SIZE = 128
+_DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+# Covers larger than this are not read or downloaded.
+_MAX_SOURCE_BYTES = 16 * 1024 * 1024
+_FETCH_TIMEOUT = 3.0
+
+
+def _load_pillow():
+    """Return PIL.Image, or None if Pillow is not installed."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+
+class ThumbnailCache:
+    """Size-bounded disk cache of cover thumbnails.
+
+    Args:
+        directory: Where thumbnails are stored.
+        size: Longest side of a thumbnail in pixels.
+        max_bytes: Total size of the cache before eviction.
+        allow_remote: Whether ``http(s)://`` covers may be downloaded.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        size: int = _DEFAULT_SIZE,
+        max_bytes: int = _DEFAULT_MAX_BYTES,
+        allow_remote: bool = False,
+    ) -> None:
+        self.directory = directory
+        self.size = size
+        self.max_bytes = max_bytes
+        self.allow_remote = allow_remote
+        self._image = _load_pillow()
+
+    def _local_path(self, url: str) -> str | None:
+        """Return the file a ``file://`` URL points to, else None."""
+        from urllib.parse import unquote, urlsplit
+
+        parts = urlsplit(url)
+        if parts.scheme != "file" or parts.netloc not in ("", "localhost"):
+            return None
+        return unquote(parts.path)
+
+    def _entry_path(self, url: str, stamp: str) -> str:
+        """Return the thumbnail path for a cover URL."""
+        import hashlib
+
+        mode = "png" if self._image is not None else "raw"
+        digest = hashlib.sha256(f"{mode}\0{self.size}\0{stamp}\0{url}".encode()).hexdigest()[:32]
+        return os.path.join(self.directory, f"{digest}.{mode}")
+
+    def _fetch(self, url: str) -> bytes | None:
+        """Download a remote cover, if allowed and not too large."""
+        if not self.allow_remote or not url.startswith(("http://", "https://")):
+            return None
+        from urllib.request import urlopen
+
+        try:
+            with urlopen(url, timeout=_FETCH_TIMEOUT) as response:
+                data = response.read(_MAX_SOURCE_BYTES + 1)
+        except (OSError, ValueError):
+            return None
+        return data if len(data) <= _MAX_SOURCE_BYTES else None
+
+    def _scale(self, data: bytes) -> bytes | None:
+        """Return a PNG thumbnail of an image, or the image itself without Pillow."""
+        if self._image is None:
+            return data
+        from io import BytesIO
+
+        try:
+            with self._image.open(BytesIO(data)) as image:
+                # Lets JPEG decode at a reduced scale instead of full size
+                image.draft("RGB", (self.size, self.size))
+                image.thumbnail((self.size, self.size))
+                if image.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+                    image = image.convert("RGB")
+                out = BytesIO()
+                image.save(out, "PNG")
+        except (OSError, ValueError, self._image.DecompressionBombError):
+            return None
+        return out.getvalue()
+
+    def get(self, url: str) -> str | None:
+        """Return the path of the thumbnail for a cover URL.
+
+        Generates and stores the thumbnail on first use.
+
+        Returns:
+            The thumbnail path, or None if the cover cannot be read
+            (unsupported scheme, remote covers disabled, missing file,
+            undecodable image).
+        """
+        source = self._local_path(url)
+        if source is not None:
+            try:
+                st = os.stat(source)
+            except OSError:
+                return None
+            if st.st_size > _MAX_SOURCE_BYTES:
+                return None
+            stamp = f"{st.st_mtime_ns}:{st.st_size}"
+        elif self.allow_remote:
+            stamp = ""
+        else:
+            return None
+
+        path = self._entry_path(url, stamp)
+        try:
+            os.utime(path)
+            return path
+        except OSError:
+            pass
+
+        if source is not None:
+            try:
+                with open(source, "rb") as f:
+                    data = f.read()
+            except OSError:
+                return None
+        else:
+            data = self._fetch(url)
+        thumbnail = self._scale(data) if data else None
+        if not thumbnail or len(thumbnail) > self.max_bytes:
+            return None
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(thumbnail)
+            os.replace(tmp_path, path)
+        except OSError:
+            return None
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: str | None = None) -> None:
+        """Delete least recently used thumbnails until under ``max_bytes``.
+
+        Args:
+            keep: A thumbnail that must survive (the one just stored).
+        """
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith((".png", ".raw")) and entry.path != keep:
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        if keep is not None:
+            with contextlib.suppress(OSError):
+                total += os.path.getsize(keep)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                continue
+
+
+_cache: ThumbnailCache | None = None
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """Return the thumbnail cache configured in the config file."""
+    global _cache
+    if _cache is None:
+        config = load_config().get("artwork", {})
+        config = config if isinstance(config, dict) else {}
+        try:
+            size = max(int(config.get("size", _DEFAULT_SIZE)), 1)
+            max_bytes = max(int(config.get("max_bytes", _DEFAULT_MAX_BYTES)), 0)
+        except (TypeError, ValueError):
+            size, max_bytes = _DEFAULT_SIZE, _DEFAULT_MAX_BYTES
+        _cache = ThumbnailCache(
+            os.path.join(get_cache_dir(), "covers"),
+            size=size,
+            max_bytes=max_bytes,
+            allow_remote=bool(config.get("remote", False)),
+        )
+    return _cache
+
+
+def get_cover_path() -> str | None:
+    """Return the thumbnail of the current player's cover art, if any."""
+    from .control import resolve_target
+    from .playerctl import run_playerctl
+
+    player = resolve_target()
+    if player is None:
+        return None
+    url = run_playerctl(["--player", player, "metadata", "mpris:artUrl"])
+    return get_thumbnail_cache().get(url) if url else None
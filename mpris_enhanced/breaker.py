@@ -0,0 +1,71 @@
+"""Per-player circuit breaker for MPRIS module.
+
+A wedged player (often a browser tab) makes every query that touches it
+run into the timeout. The breaker remembers consecutive timeouts per
+player in a small state file in the runtime directory; after
+``threshold`` of them the player is skipped for a backoff period, which
+doubles on every further failure up to ``max_backoff``. Once the period
+is over the player is tried again, and a successful query closes the
+breaker.
+"""
+
+__all__ = ["CircuitBreaker"]
+
+import time
+
+from .utils import load_json, save_json
+
+
+class CircuitBreaker:
+    """Persisted per-player failure counts and skip windows.
+
+    Args:
+        path: State file shared across invocations.
+        threshold: Consecutive timeouts before a player is skipped.
+        backoff: Initial skip period in seconds.
+        max_backoff: Upper bound for the doubled skip period.
+    """
+
+    def __init__(self, path: str, threshold: int = 2, backoff: float = 30.0, max_backoff: float = 300.0) -> None:
+        self.path = path
+        self.threshold = threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._state: dict[str, dict] | None = None
+        self._dirty = False
+
+    def _load(self) -> dict[str, dict]:
+        if self._state is None:
+            self._state = load_json(self.path, {})
+        return self._state
+
+    def open_players(self) -> list[str]:
+        """Return players that are currently being skipped."""
+        now = time.time()
+        return sorted(p for p, e in self._load().items() if e.get("open_until", 0) > now)
+
+    def record_success(self, player: str) -> None:
+        """Close the breaker for a player that answered in time."""
+        if player in self._load():
+            del self._state[player]
+            self._dirty = True
+
+    def forget(self, player: str) -> None:
+        """Drop the state of a player that is no longer running."""
+        self.record_success(player)
+
+    def record_timeout(self, player: str) -> None:
+        """Count a timeout; open (or re-open) the breaker at the threshold."""
+        entry = self._load().setdefault(player, {"failures": 0, "open_until": 0, "backoff": 0})
+        entry["failures"] += 1
+        if entry["failures"] >= self.threshold:
+            entry["backoff"] = min(max(entry["backoff"] * 2, self.backoff), self.max_backoff)
+            entry["open_until"] = time.time() + entry["backoff"]
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the state file if anything changed since it was loaded."""
+        if not self._dirty:
+            return
+        save_json(self.path, self._state)
+        self._dirty = False
@@ -0,0 +1,132 @@
+"""Cross-process snapshot cache for MPRIS module.
+
+Waybar may start several module processes within the same second (one
+per component, and one set per bar). The last collected player state is
+kept in a snapshot file in the runtime directory; while it is younger
+than the TTL every process reuses it. When it expires, the process that
+wins an ``flock`` on the lock file refreshes it, while concurrent
+processes reuse the previous snapshot or wait briefly for the new one.
+"""
+
+__all__ = ["SnapshotCache"]
+
+import fcntl
+import os
+import time
+from collections.abc import Callable
+
+from .utils import load_json, save_json
+
+# Stale snapshots younger than this may be served while another process
+# is refreshing; older ones make waiters block for the fresh state.
+_MAX_STALE = 5.0
+# Longest a waiter blocks for the leader before refreshing on its own.
+_WAIT_TIMEOUT = 2.5
+_WAIT_STEP = 0.02
+
+
+class SnapshotCache:
+    """Snapshot of collected state shared between processes.
+
+    Args:
+        path: Snapshot file path; the lock file is ``path + ".lock"``.
+        ttl: Seconds a snapshot is considered fresh.
+        key: Identifies what produced the snapshot (e.g. the backend
+            name). Snapshots written under a different key are ignored.
+    """
+
+    def __init__(self, path: str, ttl: float, key: str = "") -> None:
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.ttl = ttl
+        self.key = key
+
+    def _read(self) -> tuple[float, object] | None:
+        """Return (timestamp, payload) of the stored snapshot, if usable."""
+        data = load_json(self.path)
+        try:
+            if data["key"] != self.key:
+                return None
+            return float(data["time"]), data["payload"]
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _write(self, payload: object) -> None:
+        """Atomically replace the stored snapshot."""
+        save_json(self.path, {"key": self.key, "time": time.time(), "payload": payload})
+
+    def _fresh(self, snapshot: tuple[float, object] | None, max_age: float) -> bool:
+        return snapshot is not None and 0 <= time.time() - snapshot[0] < max_age
+
+    def get(
+        self,
+        refresh: Callable[[], object],
+        force: bool = False,
+        on_change: Callable[[object, object], None] | None = None,
+    ) -> object:
+        """Return the shared payload, refreshing it if it has expired.
+
+        Args:
+            refresh: Collects a new JSON-serializable payload.
+            force: Refresh even if the snapshot is still fresh (e.g. after
+                a change event); the result is shared with other processes.
+            on_change: Called as ``on_change(previous, new)`` when this
+                process refreshed the snapshot and the payload differs
+                from the one it replaced.
+
+        Returns:
+            The fresh payload, a recent stale one if another process is
+            currently refreshing, or a directly collected one if the lock
+            cannot be used.
+        """
+        snapshot = self._read()
+        if not force and self._fresh(snapshot, self.ttl):
+            return snapshot[1]
+        started = time.time()
+
+        try:
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError:
+            return refresh()
+
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Another process is refreshing: reuse the previous
+                # snapshot if recent enough, else wait for the new one.
+                if not force and self._fresh(snapshot, _MAX_STALE):
+                    return snapshot[1]
+                if not self._wait_for_lock(fd):
+                    return refresh()
+                latest = self._read()
+                if self._fresh(latest, self.ttl) and (not force or latest[0] >= started):
+                    return latest[1]
+                snapshot = latest
+            else:
+                # The previous holder may have just refreshed it
+                latest = self._read()
+                if not force and self._fresh(latest, self.ttl):
+                    return latest[1]
+                snapshot = latest
+
+            payload = refresh()
+            self._write(payload)
+            if on_change is not None and snapshot is not None and snapshot[1] != payload:
+                on_change(snapshot[1], payload)
+            return payload
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _wait_for_lock(fd: int) -> bool:
+        """Poll for the lock until acquired or ``_WAIT_TIMEOUT`` elapses."""
+        deadline = time.monotonic() + _WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(_WAIT_STEP)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                continue
+        return False
@@ -0,0 +1,81 @@
+"""Thin client for the resident MPRIS server.
+
+Forwards the command line to a running ``serve`` instance over a Unix
+domain socket and prints its reply. Only the standard library modules
+needed for that are imported, and ``socket`` only once the server's
+socket exists, so a tick costs little more than interpreter startup. If
+no server is running, or it declines the request, the full module is
+loaded and run directly.
+"""
+
+__all__ = ["SOCKET_NAME", "REFRESH_REQUEST", "get_socket_path", "request", "notify_refresh", "main"]
+
+import os
+import sys
+
+SOCKET_NAME = "waybar-mpris-enhanced.sock"
+
+# Sent instead of a command line to make the server drop its cached state.
+REFRESH_REQUEST = "!refresh"
+
+_TIMEOUT = 1.0
+
+
+def get_socket_path() -> str | None:
+    """Return the server socket path, or None if $XDG_RUNTIME_DIR is unset."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    return os.path.join(runtime_dir, SOCKET_NAME) if runtime_dir else None
+
+
+def request(argv: list[str]) -> bytes | None:
+    """Ask the server to handle a command line.
+
+    Args:
+        argv: Command line arguments, as they would be passed to ``main``.
+
+    Returns:
+        The server's reply, or None if no server is reachable or it
+        declined the request (empty reply).
+    """
+    path = get_socket_path()
+    # Without a server, skip importing socket (and selectors) altogether
+    if path is None or not os.path.exists(path):
+        return None
+
+    import socket
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(_TIMEOUT)
+            sock.connect(path)
+            sock.sendall("\0".join(argv).encode())
+            sock.shutdown(socket.SHUT_WR)
+            chunks = []
+            while chunk := sock.recv(65536):
+                chunks.append(chunk)
+    except OSError:
+        return None
+
+    return b"".join(chunks) or None
+
+
+def notify_refresh() -> None:
+    """Tell a running server, if any, to re-collect player state."""
+    request([REFRESH_REQUEST])
+
+
+def main() -> None:
+    """Render via the server if possible, else fall back to the direct path."""
+    reply = request(sys.argv[1:])
+    if reply is None:
+        from .main import main as direct_main
+
+        direct_main()
+        return
+
+    sys.stdout.buffer.write(reply)
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,28 @@
-"""Component modules for MPRIS waybar output."""
+"""Component modules for MPRIS waybar output.
 
-from .base import Component, ComponentOutput
-from .controls import NextComponent, PlayComponent, PrevComponent
-from .info import EndashComponent, InfoComponent, PlayerIconComponent
+Component classes are imported lazily on first attribute access, so that
+rendering one component does not import every component module.
+"""
 
-__all__ = [
-    "Component",
-    "ComponentOutput",
-    "InfoComponent",
-    "PlayerIconComponent",
-    "EndashComponent",
-    "PrevComponent",
-    "PlayComponent",
-    "NextComponent",
-]
+import importlib
+
+_EXPORTS = {
+    "Component": "base",
+    "ComponentOutput": "base",
+    "InfoComponent": "info",
+    "PlayerIconComponent": "info",
+    "EndashComponent": "info",
+    "PrevComponent": "controls",
+    "PlayComponent": "controls",
+    "NextComponent": "controls",
+    "ProgressComponent": "progress",
+    "PlayersComponent": "players",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
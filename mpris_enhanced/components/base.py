@@ -5,7 +5,8 @@ components that render Waybar-compatible JSON output.
 """
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections.abc import Hashable
+from dataclasses import dataclass, fields
 
 from ..playerctl import PlayerInfo
 
@@ -37,10 +38,12 @@ class ComponentOutput:
         return result
 
 
-@dataclass
+@dataclass(frozen=True)
 class ComponentArgs:
     """Arguments passed to components.
 
+    Frozen so that it can be part of a render cache key.
+
     Attributes:
         scroll: Enable scrolling animation for long text.
         max_length: Maximum text length before truncation/scrolling.
@@ -57,8 +60,15 @@ class Component(ABC):
 
     All MPRIS components inherit from this class and must implement
     the render() method to provide Waybar-compatible output.
+
+    Attributes:
+        fields: Names of the PlayerInfo fields the output depends on.
+            Together with ``frame()`` they key the render cache (see
+            ``render.py``), so listing too few fields serves stale output.
     """
 
+    fields: tuple[str, ...] = tuple(f.name for f in fields(PlayerInfo))
+
     def __init__(self, args: ComponentArgs | None = None) -> None:
         """Initialize component with optional arguments.
 
@@ -79,6 +89,29 @@ class Component(ABC):
         """
         ...
 
+    def frame(self, info: PlayerInfo | None) -> Hashable:
+        """Return the state beyond ``fields`` that the next output depends on.
+
+        Animated components return their current frame here (e.g. the
+        scroll position) and advance their animation, so it is called
+        exactly once per rendered tick.
+
+        Args:
+            info: Current player information, or None if no player active.
+
+        Returns:
+            A hashable value, None for components without extra state.
+        """
+        return None
+
+    def render_frame(self, info: PlayerInfo | None, frame: Hashable) -> ComponentOutput:
+        """Render the output for a frame returned by ``frame()``.
+
+        Components that override ``frame()`` override this as well and
+        implement ``render()`` as ``render_frame(info, frame(info))``.
+        """
+        return self.render(info)
+
     def render_hidden(self) -> ComponentOutput:
         """Render hidden output when no player is active.
 
@@ -16,6 +16,7 @@ class PrevComponent(Component):
     """
 
     name = "prev"
+    fields = ()
 
     def render(self, info: PlayerInfo | None) -> ComponentOutput:
         if not info:
@@ -35,6 +36,7 @@ class PlayComponent(Component):
     """
 
     name = "play"
+    fields = ("status",)
 
     def render(self, info: PlayerInfo | None) -> ComponentOutput:
         if not info:
@@ -60,6 +62,7 @@ class NextComponent(Component):
     """
 
     name = "next"
+    fields = ()
 
     def render(self, info: PlayerInfo | None) -> ComponentOutput:
         if not info:
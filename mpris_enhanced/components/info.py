@@ -4,10 +4,18 @@ Components for displaying media information including player icons,
 track titles, and separator elements.
 """
 
+from collections.abc import Hashable
+
 from ..constants import PLAYER_ICONS
-from ..playerctl import PlayerInfo
-from ..utils import escape_pango, get_scrolling_text, truncate_text
-from .base import Component, ComponentOutput
+from ..formats import get_template
+from ..playerctl import PlayerInfo, get_skipped_players
+from ..utils import (
+    escape_pango,
+    get_scroll_position,
+    scroll_window,
+    truncate_text,
+)
+from .base import Component, ComponentArgs, ComponentOutput
 
 
 class InfoComponent(Component):
@@ -15,11 +23,38 @@ class InfoComponent(Component):
 
     Displays the current media player icon and track title with optional
     scrolling for long titles. Includes tooltip with full information.
+    Both are rendered from the ``info`` templates (see ``formats.py``);
+    the text is truncated or scrolled after formatting.
     """
 
     name = "info"
 
+    def __init__(self, args: ComponentArgs | None = None) -> None:
+        super().__init__(args)
+        self.text_template = get_template("info", "text")
+        self.tooltip_template = get_template("info", "tooltip")
+        self.fields = tuple(
+            sorted({"player", "status"} | self.text_template.attributes | self.tooltip_template.attributes)
+        )
+
+    def frame(self, info: PlayerInfo | None) -> Hashable:
+        """Return the scroll position and the players being skipped."""
+        if not info:
+            return None
+        position = None
+        if self.args.scroll:
+            position = get_scroll_position(
+                self.text_template.render(info),
+                self.args.max_length,
+                self.args.scroll_speed,
+                advance=info.status == "playing",
+            )
+        return position, tuple(get_skipped_players())
+
     def render(self, info: PlayerInfo | None) -> ComponentOutput:
+        return self.render_frame(info, self.frame(info))
+
+    def render_frame(self, info: PlayerInfo | None, frame: Hashable) -> ComponentOutput:
         if not info:
             return ComponentOutput(
                 text="",
@@ -29,23 +64,19 @@ class InfoComponent(Component):
 
         player_icon = PLAYER_ICONS.get(info.player, PLAYER_ICONS["default"])
 
+        position, skipped = frame
+        title = self.text_template.render(info)
         if self.args.scroll:
-            title = get_scrolling_text(
-                info.title,
-                self.args.max_length,
-                self.args.scroll_speed,
-            )
+            title = scroll_window(title, self.args.max_length, position)
         else:
-            title = truncate_text(info.title, self.args.max_length)
+            title = truncate_text(title, self.args.max_length)
 
-        # Escape title, artist, and player name for Pango markup
-        escaped_title = escape_pango(title)
-        escaped_artist = escape_pango(info.artist)
-        escaped_player = escape_pango(info.player.title())
-        escaped_full_title = escape_pango(info.title)
+        # Escape the values for Pango markup; tooltip templates may add markup
+        text = f"{player_icon}  {escape_pango(title)}"
+        tooltip = self.tooltip_template.render(info, escape_pango)
 
-        text = f"{player_icon}  {escaped_title}"
-        tooltip = f"{player_icon} {escaped_player}: {escaped_artist} - {escaped_full_title}"
+        if skipped:
+            tooltip += f"\nNot responding: {escape_pango(', '.join(skipped))}"
 
         return ComponentOutput(
             text=text,
@@ -61,6 +92,7 @@ class PlayerIconComponent(Component):
     """
 
     name = "player-icon"
+    fields = ("player",)
 
     def render(self, info: PlayerInfo | None) -> ComponentOutput:
         if not info:
@@ -82,6 +114,7 @@ class EndashComponent(Component):
     """
 
     name = "endash"
+    fields = ()
 
     def render(self, info: PlayerInfo | None) -> ComponentOutput:
         if not info:
@@ -0,0 +1,71 @@
+"""Players overview component (players).
+
+Shows every active player compactly, rendered from the same batched
+collection that selects the current player.
+"""
+
+from collections.abc import Hashable
+
+from ..constants import PLAYER_ICONS, STATUS_ICONS
+from ..playerctl import PlayerInfo, get_collected_players
+from ..utils import escape_pango
+from .base import Component, ComponentOutput
+
+# Players beyond this many are summarized as "+N" in the text; the
+# tooltip still lists all of them.
+_MAX_SHOWN = 8
+
+
+def _player_icon(player: str) -> str:
+    # Like the picker: browser tabs etc. report "name.instanceN"
+    return PLAYER_ICONS.get(player.lower().split(".")[0], PLAYER_ICONS["default"])
+
+
+class PlayersComponent(Component):
+    """All active players with their status.
+
+    Displays a player icon and status glyph for each player, best
+    ranked first, with the selected (or pinned) player in bold. The
+    tooltip lists the track of every player.
+    """
+
+    name = "players"
+    fields = ("player",)
+
+    def frame(self, info: PlayerInfo | None) -> Hashable:
+        """Return the displayed state of every collected player."""
+        return tuple((p.player, p.status, p.artist, p.title) for p in get_collected_players())
+
+    def render(self, info: PlayerInfo | None) -> ComponentOutput:
+        return self.render_frame(info, self.frame(info))
+
+    def render_frame(self, info: PlayerInfo | None, frame: Hashable) -> ComponentOutput:
+        if not info or not frame:
+            return self.render_hidden()
+
+        # Collected names are verbatim; info.player is lowercased
+        selected = info.player.lower()
+        shown = list(frame[:_MAX_SHOWN])
+        if all(p[0].lower() != selected for p in shown):
+            # Keep the selected player visible when it ranks low (pinned)
+            shown[-1:] = [p for p in frame if p[0].lower() == selected][:1] or shown[-1:]
+
+        entries = []
+        for player, status, _, _ in shown:
+            entry = f"{_player_icon(player)} {STATUS_ICONS.get(status, STATUS_ICONS['default'])}"
+            entries.append(f"<b>{entry}</b>" if player.lower() == selected else entry)
+        text = "  ".join(entries)
+        if len(frame) > len(shown):
+            text += f"  +{len(frame) - len(shown)}"
+
+        lines = []
+        for player, status, artist, title in frame:
+            track = f"{artist} - {title}" if artist else title
+            line = f"{_player_icon(player)} {escape_pango(player)}: {escape_pango(track or status)}"
+            lines.append(f"<b>{line}</b>" if player.lower() == selected else line)
+
+        return ComponentOutput(
+            text=text,
+            tooltip="\n".join(lines),
+            class_=f"media-players {info.status}",
+        )
@@ -0,0 +1,145 @@
+"""Track progress component.
+
+Shows elapsed and total time with a compact bar. The playback position
+is not polled on every tick: it is taken from the collection that
+reports a track, status or rate change and extrapolated locally in
+between.
+"""
+
+import os
+import time
+from collections.abc import Hashable
+
+from ..playerctl import PlayerInfo, get_backend, get_reported_name
+from ..utils import (
+    escape_pango,
+    format_time,
+    get_runtime_dir,
+    load_json,
+    save_json,
+)
+from .base import Component, ComponentOutput
+
+_BAR_WIDTH = 8
+_BAR_FILLED = "▰"
+_BAR_EMPTY = "▱"
+
+# Resync at least this often (seconds) to catch seeks made elsewhere.
+# Only forward seeks past the end of the track are noticed sooner.
+_RESYNC_INTERVAL = 30.0
+
+
+class PositionTracker:
+    """Extrapolates the playback position from a persisted anchor.
+
+    The anchor records a known position, when it was valid, and the
+    state it belongs to. While the player, track, status and rate are
+    unchanged, the position is computed locally as
+    ``anchor + elapsed * rate``. When that state changes, the anchor is
+    reset to the position collected along with the change. When the
+    estimate runs past the end of the track (a seek or a missed track
+    change), or every ``_RESYNC_INTERVAL``, the backend is asked for the
+    position instead, as resident modes may render from a collection
+    older than the anchor. Other seeks are not detected: until the next
+    resync the estimate is off by the seeked distance, unless the seek
+    invalidates the anchor. The rate is only known with the D-Bus
+    backend (see ``PlayerInfo``).
+
+    Args:
+        path: File the anchor is persisted in, shared across invocations.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._anchor: dict | None = None
+        self._loaded = False
+
+    def _load(self) -> dict | None:
+        if not self._loaded:
+            self._loaded = True
+            self._anchor = load_json(self.path)
+        return self._anchor
+
+    def _save(self, anchor: dict) -> None:
+        self._anchor = anchor
+        save_json(self.path, anchor)
+
+    def invalidate(self) -> None:
+        """Make the next call ask the backend for the position (e.g. after a seek)."""
+        anchor = self._load()
+        if anchor is not None:
+            self._save({**anchor, "time": 0})
+
+    @staticmethod
+    def _state(info: PlayerInfo) -> list:
+        return [info.player, info.title, info.artist, info.status, info.length, info.rate]
+
+    def position(self, info: PlayerInfo) -> float:
+        """Return the current position of the player described by info."""
+        now = time.time()
+        anchor = self._load()
+
+        position = None
+        if anchor is not None and anchor["state"] == self._state(info):
+            elapsed = now - anchor["time"]
+            rate = info.rate if info.status == "playing" else 0.0
+            estimate = anchor["position"] + elapsed * rate
+            if elapsed < _RESYNC_INTERVAL and (not info.length or estimate <= info.length):
+                return estimate
+            position = get_backend().get_position(get_reported_name(info.player))
+        if position is None:
+            position = info.position
+        self._save({"state": self._state(info), "position": position, "time": now})
+        return position
+
+
+_tracker: PositionTracker | None = None
+
+
+def get_position_tracker() -> PositionTracker:
+    """Return the shared position tracker in the runtime directory."""
+    global _tracker
+    if _tracker is None:
+        _tracker = PositionTracker(os.path.join(get_runtime_dir(), "progress.json"))
+    return _tracker
+
+
+class ProgressComponent(Component):
+    """Track progress component.
+
+    Displays elapsed time, a compact progress bar and total length.
+    Tracks without a known length show the elapsed time only.
+    """
+
+    name = "progress"
+    fields = ("player", "title", "status", "length", "rate")
+
+    def frame(self, info: PlayerInfo | None) -> Hashable:
+        """Return the current position in whole seconds."""
+        if not info or info.status == "stopped":
+            return None
+        position = get_position_tracker().position(info)
+        return int(min(position, info.length) if info.length else position)
+
+    def render(self, info: PlayerInfo | None) -> ComponentOutput:
+        return self.render_frame(info, self.frame(info))
+
+    def render_frame(self, info: PlayerInfo | None, frame: Hashable) -> ComponentOutput:
+        if frame is None:
+            return self.render_hidden()
+
+        position = frame
+        if info.length:
+            filled = round(_BAR_WIDTH * position / info.length)
+            bar = _BAR_FILLED * filled + _BAR_EMPTY * (_BAR_WIDTH - filled)
+            text = f"{format_time(position)} {bar} {format_time(info.length)}"
+            tooltip = f"{escape_pango(info.title)}: {format_time(position)} / {format_time(info.length)}"
+        else:
+            text = format_time(position)
+            tooltip = f"{escape_pango(info.title)}: {text}"
+
+        return ComponentOutput(
+            text=text,
+            tooltip=tooltip,
+            class_=f"media-progress {info.status}",
+        )
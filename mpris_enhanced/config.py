@@ -0,0 +1,56 @@
+"""User configuration for MPRIS module.
+
+Optional settings are read once per process from
+``$XDG_CONFIG_HOME/waybar-mpris-enhanced/config.json`` (default
+``~/.config``). A missing or unreadable file means all defaults.
+"""
+
+__all__ = ["get_config_path", "load_config", "get_signals"]
+
+import json
+import os
+
+_config: dict | None = None
+
+
+def get_config_path() -> str:
+    """Return the path of the user configuration file."""
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(config_home, "waybar-mpris-enhanced", "config.json")
+
+
+def load_config() -> dict:
+    """Return the parsed configuration file, or an empty dict."""
+    global _config
+    if _config is None:
+        try:
+            with open(get_config_path()) as f:
+                _config = json.load(f)
+        except (OSError, ValueError):
+            _config = {}
+        if not isinstance(_config, dict):
+            _config = {}
+    return _config
+
+
+def get_signals() -> dict[str, int]:
+    """Return the Waybar refresh signal offset configured per component.
+
+    Read from ``$MPRIS_ENHANCED_SIGNALS`` (``"play=8,info=9"``) if set,
+    else from the ``"signals"`` object of the config file
+    (``{"play": 8, "info": 9}``). Each value N matches ``"signal": N``
+    in the component's Waybar module, i.e. ``SIGRTMIN+N``.
+    """
+    env = os.environ.get("MPRIS_ENHANCED_SIGNALS")
+    if env is not None:
+        raw = dict(item.split("=", 1) for item in env.split(",") if "=" in item)
+    else:
+        raw = load_config().get("signals", {})
+
+    signals = {}
+    for component, value in raw.items():
+        try:
+            signals[component.strip()] = int(value)
+        except (TypeError, ValueError):
+            continue
+    return signals
@@ -1,6 +1,6 @@
-"""Icon constants for MPRIS module."""
+"""Icon and command constants for MPRIS module."""
 
-__all__ = ["PLAYER_ICONS", "STATUS_ICONS", "CONTROL_ICONS"]
+__all__ = ["PLAYER_ICONS", "STATUS_ICONS", "CONTROL_ICONS", "CONTROL_ACTIONS", "ADJUSTMENTS"]
 
 PLAYER_ICONS = {
     "default": "",
@@ -26,3 +26,18 @@ CONTROL_ICONS = {
     "play": "",
     "pause": "",
 }
+
+# 'control' subcommand action -> playerctl command
+CONTROL_ACTIONS = {
+    "prev": "previous",
+    "next": "next",
+    "play-pause": "play-pause",
+    "stop": "stop",
+}
+
+# Subcommand -> (playerctl command, scale from the command-line unit).
+# Volume deltas are given in percent, seek deltas in seconds.
+ADJUSTMENTS = {
+    "volume": ("volume", 0.01),
+    "seek": ("position", 1.0),
+}
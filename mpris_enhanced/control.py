@@ -0,0 +1,72 @@
+"""Playback control actions for MPRIS module.
+
+Implements the ``control`` subcommand used by the buttons' on-click
+handlers. The target player is resolved from the pin or the shared
+snapshot without a full enumeration, the action is sent with a single
+playerctl call, and the shared state is refreshed (and Waybar signalled,
+if configured) right away so the next render already shows the new
+status.
+"""
+
+__all__ = ["CONTROL_ACTIONS", "resolve_target", "run_control"]
+
+from .constants import CONTROL_ACTIONS
+from .playerctl import (
+    collect_players,
+    get_pinned_player,
+    pin_player,
+    resolve_best_player,
+    run_playerctl,
+)
+
+
+def resolve_target() -> str | None:
+    """Return the player a control action should be sent to.
+
+    Uses the pinned player if there is one, otherwise the best player
+    from the shared snapshot (which is only refreshed if it has expired).
+    """
+    pinned = get_pinned_player()
+    if pinned:
+        return pinned
+    best = resolve_best_player(collect_players())
+    return best.player if best else None
+
+
+def refresh_shared_state() -> None:
+    """Re-collect player state, then tell a running server and Waybar.
+
+    Waybar is signalled even if the snapshot looks unchanged, since the
+    player may apply the action slightly after playerctl returns.
+    """
+    from .client import notify_refresh
+    from .signals import notify_waybar
+
+    collect_players(refresh=True)
+    notify_refresh()
+    notify_waybar()
+
+
+def run_control(action: str) -> bool:
+    """Send a playback action to the current player.
+
+    Args:
+        action: Key of ``CONTROL_ACTIONS``.
+
+    Returns:
+        True if playerctl accepted the command.
+    """
+    player = resolve_target()
+    if player is None:
+        return False
+
+    command = CONTROL_ACTIONS[action]
+    ok = run_playerctl(["--player", player, command]) is not None
+    if not ok and player == get_pinned_player():
+        # The pinned player went away: clear the pin and retry once
+        pin_player(None)
+        player = resolve_target()
+        ok = player is not None and run_playerctl(["--player", player, command]) is not None
+
+    refresh_shared_state()
+    return ok
@@ -0,0 +1,109 @@
+"""Long-running follow mode for MPRIS module.
+
+Instead of being relaunched by Waybar on every ``interval`` tick, the
+module stays resident, listens for player change events from
+``playerctl --follow`` and writes a new JSON line only when the rendered
+output actually changes.
+"""
+
+__all__ = ["follow"]
+
+import os
+import selectors
+import subprocess
+import sys
+import time
+
+from .components.base import Component
+from .playerctl import get_pin_mtime, get_player_info
+from .render import RenderCache
+
+# Template watched for changes; any status or track change re-emits a line.
+_WATCH_FORMAT = "{{playerInstance}}{{status}}{{title}}{{artist}}"
+
+
+def _start_watcher() -> subprocess.Popen | None:
+    """Start a ``playerctl --follow`` process reporting player changes.
+
+    Returns:
+        The running watcher process, or None if playerctl is not available.
+    """
+    try:
+        return subprocess.Popen(
+            ["playerctl", "--all-players", "--follow", "metadata", "--format", _WATCH_FORMAT],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+
+
+def _emit(line: bytes) -> None:
+    """Write one encoded JSON line to stdout and flush it for Waybar."""
+    sys.stdout.buffer.write(line)
+    sys.stdout.buffer.flush()
+
+
+def follow(component: Component, interval: float = 1.0) -> None:
+    """Render a component continuously, emitting output only on change.
+
+    Player state is refreshed whenever the watcher reports an event or
+    the pinned player changes. Between events, the component is
+    re-rendered every ``interval`` seconds from the cached state so that
+    scrolling text keeps moving without querying playerctl. If the
+    watcher cannot be started or exits, state is polled every
+    ``interval`` seconds instead.
+
+    Args:
+        component: Component instance to render.
+        interval: Seconds between timer ticks (scroll frames and polls).
+
+    The function returns when stdout is closed (e.g. Waybar exits).
+    """
+    watcher = _start_watcher()
+    selector = selectors.DefaultSelector()
+    if watcher is not None:
+        selector.register(watcher.stdout, selectors.EVENT_READ)
+
+    info = get_player_info()
+    pin_mtime = get_pin_mtime()
+    render_cache = RenderCache()
+    last_line = None
+    next_tick = time.monotonic() + interval
+
+    try:
+        while True:
+            line = render_cache.render(component, info)
+            if line != last_line:
+                _emit(line)
+                last_line = line
+
+            refresh = False
+            timeout = max(0.0, next_tick - time.monotonic())
+            events = selector.select(timeout) if watcher is not None else []
+            if watcher is None:
+                time.sleep(timeout)
+
+            for key, _ in events:
+                # Drain everything that is buffered; one refresh covers a burst
+                if not os.read(key.fd, 65536):
+                    selector.unregister(key.fileobj)
+                    watcher.wait()
+                    watcher = None
+                refresh = True
+
+            if time.monotonic() >= next_tick:
+                next_tick = time.monotonic() + interval
+                mtime = get_pin_mtime()
+                if watcher is None or mtime != pin_mtime:
+                    pin_mtime = mtime
+                    refresh = True
+
+            if refresh:
+                info = get_player_info(refresh=True)
+    except (BrokenPipeError, KeyboardInterrupt):
+        pass
+    finally:
+        if watcher is not None:
+            watcher.terminate()
+        selector.close()
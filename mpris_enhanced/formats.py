@@ -0,0 +1,140 @@
+"""User-defined output templates for MPRIS module.
+
+Component text and tooltips are ``str.format`` templates. Defaults
+reproduce the built-in look; they can be overridden per component in the
+``"formats"`` object of the config file::
+
+    {
+      "formats": {
+        "info": {
+          "text": "{artist} — {title}",
+          "tooltip": "{icon} <b>{title}</b>\\n{artist} [{album}]"
+        }
+      }
+    }
+
+Templates are parsed once per process. Fields that do not exist are
+rejected when the configuration is loaded, and the player metadata that
+only some templates use (e.g. the album) is only fetched when a
+template references it (see ``get_template_fields``).
+"""
+
+__all__ = ["FIELDS", "Template", "get_template", "get_template_fields"]
+
+from .config import load_config
+from .constants import PLAYER_ICONS
+from .utils import format_time
+
+# Template field -> (PlayerInfo attribute it needs, value getter)
+FIELDS = {
+    "icon": ("player", lambda info: PLAYER_ICONS.get(info.player, PLAYER_ICONS["default"])),
+    "player": ("player", lambda info: info.player.title()),
+    "title": ("title", lambda info: info.title),
+    "artist": ("artist", lambda info: info.artist),
+    "album": ("album", lambda info: info.album),
+    "status": ("status", lambda info: info.status),
+    "length": ("length", lambda info: format_time(info.length) if info.length else ""),
+}
+
+# Built-in templates per component and slot. The info text is truncated
+# or scrolled after formatting and shown after the player icon.
+DEFAULT_TEMPLATES = {
+    "info": {
+        "text": "{title}",
+        "tooltip": "{icon} {player}: {artist} - {title}",
+    },
+}
+
+
+class Template:
+    """A compiled output template.
+
+    Args:
+        source: ``str.format`` template referencing names from ``FIELDS``.
+        where: Where the template comes from, for error messages.
+
+    Raises:
+        ValueError: If the template is malformed or references an
+            unknown field.
+    """
+
+    def __init__(self, source: str, where: str = "template") -> None:
+        from string import Formatter
+
+        if not isinstance(source, str):
+            raise ValueError(f"{where}: template must be a string")
+        try:
+            names = [name for _, name, _, _ in Formatter().parse(source) if name is not None]
+        except ValueError as e:
+            raise ValueError(f"{where}: {e}") from None
+        for name in names:
+            if name not in FIELDS:
+                raise ValueError(f"{where}: unknown field {{{name}}} (available: {', '.join(FIELDS)})")
+
+        self.source = source
+        self.names = tuple(dict.fromkeys(names))
+        self._getters = tuple((name, FIELDS[name][1]) for name in self.names)
+
+    @property
+    def attributes(self) -> set[str]:
+        """PlayerInfo attributes the template depends on."""
+        return {FIELDS[name][0] for name in self.names}
+
+    def render(self, info, escape=None) -> str:
+        """Format the template for a PlayerInfo record.
+
+        Args:
+            info: The player to describe.
+            escape: Optional function applied to every field value (e.g.
+                ``escape_pango``), leaving the template's own markup intact.
+        """
+        if escape is None:
+            values = {name: getter(info) for name, getter in self._getters}
+        else:
+            values = {name: escape(getter(info)) for name, getter in self._getters}
+        return self.source.format_map(values)
+
+
+_templates: dict[str, dict[str, Template]] | None = None
+
+
+def _load_templates() -> dict[str, dict[str, Template]]:
+    """Compile the default templates merged with the configured ones.
+
+    Raises:
+        ValueError: For unknown components, slots or fields.
+    """
+    global _templates
+    if _templates is None:
+        configured = load_config().get("formats", {})
+        if not isinstance(configured, dict):
+            raise ValueError("formats: expected an object")
+        for component, slots in configured.items():
+            if component not in DEFAULT_TEMPLATES:
+                raise ValueError(f"formats.{component}: component has no templates")
+            if not isinstance(slots, dict) or set(slots) - set(DEFAULT_TEMPLATES[component]):
+                raise ValueError(f"formats.{component}: expected slots {', '.join(DEFAULT_TEMPLATES[component])}")
+
+        _templates = {
+            component: {
+                slot: Template(configured.get(component, {}).get(slot, default), f"formats.{component}.{slot}")
+                for slot, default in slots.items()
+            }
+            for component, slots in DEFAULT_TEMPLATES.items()
+        }
+    return _templates
+
+
+def get_template(component: str, slot: str) -> Template:
+    """Return the compiled template for a component's text or tooltip."""
+    return _load_templates()[component][slot]
+
+
+def get_template_fields() -> set[str]:
+    """Return the PlayerInfo attributes referenced by any template.
+
+    Raises:
+        ValueError: If the configured templates are invalid, so that
+            mistakes are reported at startup rather than on render.
+    """
+    return {attr for slots in _load_templates().values() for template in slots.values() for attr in template.attributes}
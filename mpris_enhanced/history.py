@@ -0,0 +1,308 @@
+"""Opt-in listening history for MPRIS module.
+
+When enabled (``--history`` or ``MPRIS_ENHANCED_HISTORY=1``), the
+process that refreshes the shared snapshot records when each player
+starts and stops playing a track. Nothing is recorded while the tracks
+and playback states stay the same. Events are buffered in memory and
+appended in one write when the process exits (and periodically in
+resident modes).
+
+The log lives in ``$XDG_STATE_HOME/waybar-mpris-enhanced/history`` as
+append-only text segments with one tab-separated event per line::
+
+    1767225600  +  spotify  Artist  Title
+    1767225790  -  spotify
+
+The active segment ``current.log`` is rotated to ``<time_ns>.log``
+once it exceeds ``_SEGMENT_BYTES``, so a segment's name is the time of
+its last event. Queries (the ``history`` subcommand) stream over the
+segments line by line and skip the ones that end before their time
+window, so they stay fast on years of history.
+"""
+
+__all__ = [
+    "HistoryLog",
+    "enable",
+    "is_enabled",
+    "record_change",
+    "flush",
+    "get_log",
+    "top_artists",
+    "player_time",
+    "last_tracks",
+    "format_history",
+]
+
+import atexit
+import os
+import time
+
+from .utils import get_state_dir
+
+# Active segments are rotated beyond this size.
+_SEGMENT_BYTES = 256 * 1024
+# Resident processes append buffered events at most this often...
+_FLUSH_INTERVAL = 60.0
+# ...or as soon as this many are pending.
+_FLUSH_EVENTS = 64
+# Playing sessions never closed by a stop event (e.g. the module was
+# not running when playback stopped) count for at most this long.
+_MAX_SESSION = 4 * 3600
+
+_CURRENT = "current.log"
+
+# None until enabled or disabled explicitly: read from the environment
+_enabled: bool | None = None
+_pending: list[str] = []
+_last_flush = 0.0
+
+
+class HistoryLog:
+    """Append-only, size-rotated event log.
+
+    Args:
+        directory: Where the segments are stored.
+        segment_bytes: Size beyond which the active segment is rotated.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = _SEGMENT_BYTES) -> None:
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.current = os.path.join(directory, _CURRENT)
+
+    def append(self, lines: list[str]) -> None:
+        """Append event lines with a single write, rotating if needed.
+
+        Raises:
+            OSError: If the log cannot be written.
+        """
+        import fcntl
+
+        os.makedirs(self.directory, exist_ok=True)
+        data = "".join(lines).encode()
+        while True:
+            fd = os.open(self.current, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    rotated = os.fstat(fd).st_ino != os.stat(self.current).st_ino
+                except FileNotFoundError:
+                    rotated = True
+                if rotated:
+                    # Another process rotated the segment while we waited
+                    continue
+                os.write(fd, data)
+                if os.fstat(fd).st_size >= self.segment_bytes:
+                    os.rename(self.current, os.path.join(self.directory, f"{time.time_ns():020d}.log"))
+                return
+            finally:
+                os.close(fd)
+
+    def segments(self, since: float = 0.0) -> list[str]:
+        """Return segment paths oldest first, skipping those ending before ``since``."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        rotated = sorted(n for n in names if n.endswith(".log") and n[:-4].isdigit())
+        paths = [os.path.join(self.directory, n) for n in rotated if int(n[:-4]) / 1e9 >= since]
+        if _CURRENT in names:
+            paths.append(self.current)
+        return paths
+
+    @staticmethod
+    def events(paths: list[str], since: float = 0.0):
+        """Yield ``(time, kind, player, artist, title)`` from segments in order.
+
+        ``kind`` is "+" for a start and "-" for a stop; stops have empty
+        artist and title. Malformed lines are skipped.
+        """
+        for path in paths:
+            try:
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    for line in f:
+                        fields = line.rstrip("\n").split("\t")
+                        if len(fields) < 3:
+                            continue
+                        try:
+                            ts = int(fields[0])
+                        except ValueError:
+                            continue
+                        if ts < since:
+                            continue
+                        if fields[1] == "+" and len(fields) == 5:
+                            yield ts, "+", fields[2], fields[3], fields[4]
+                        elif fields[1] == "-":
+                            yield ts, "-", fields[2], "", ""
+            except OSError:
+                continue
+
+
+def get_log() -> HistoryLog:
+    """Return the history log under the state directory."""
+    return HistoryLog(os.path.join(get_state_dir(), "history"))
+
+
+def enable(flag: bool | None = None) -> None:
+    """Turn history recording on or off.
+
+    Args:
+        flag: True/False to force the setting, or None to read
+            ``$MPRIS_ENHANCED_HISTORY`` (enabled for any non-empty value
+            other than ``0``).
+    """
+    global _enabled, _last_flush
+    if flag is None:
+        flag = os.environ.get("MPRIS_ENHANCED_HISTORY", "0") not in ("", "0")
+    if flag and not _enabled:
+        _last_flush = time.monotonic()
+        atexit.register(flush)
+    _enabled = flag
+
+
+def is_enabled() -> bool:
+    """Return whether history recording is on.
+
+    Unless ``enable`` was called, this reads the environment on first use.
+    """
+    if _enabled is None:
+        enable(None)
+    return _enabled
+
+
+def _clean(value: str) -> str:
+    return value.replace("\t", " ").replace("\n", " ")
+
+
+def record_change(previous: list[dict], current: list[dict]) -> None:
+    """Record the starts and stops between two snapshots of player state.
+
+    Args:
+        previous: Player dicts (``asdict(PlayerInfo)``) before the change.
+        current: Player dicts after it. Players that do not answer
+            (status 'unknown') are treated as unchanged until they do.
+    """
+    if not is_enabled():
+        return
+    ts = int(time.time())
+    before = {p["player"]: p for p in previous if p["status"] == "playing"}
+    after = {p["player"]: p for p in current if p["status"] == "playing"}
+    unknown = {p["player"] for p in current if p["status"] == "unknown"}
+
+    for name, p in before.items():
+        q = after.get(name)
+        if name not in unknown and (q is None or (q["artist"], q["title"]) != (p["artist"], p["title"])):
+            _pending.append(f"{ts}\t-\t{_clean(name)}\n")
+    for p in previous:
+        # A player that was not answering may have stopped meanwhile
+        name = p["player"]
+        if p["status"] == "unknown" and name not in after and name not in unknown:
+            _pending.append(f"{ts}\t-\t{_clean(name)}\n")
+    for name, q in after.items():
+        p = before.get(name)
+        if p is None or (p["artist"], p["title"]) != (q["artist"], q["title"]):
+            _pending.append(f"{ts}\t+\t{_clean(name)}\t{_clean(q['artist'])}\t{_clean(q['title'])}\n")
+
+    if len(_pending) >= _FLUSH_EVENTS or time.monotonic() - _last_flush >= _FLUSH_INTERVAL:
+        flush()
+
+
+def flush() -> None:
+    """Append buffered events to the log."""
+    global _pending, _last_flush
+    _last_flush = time.monotonic()
+    if not _pending:
+        return
+    try:
+        get_log().append(_pending)
+    except OSError:
+        return
+    _pending = []
+
+
+def top_artists(log: HistoryLog, since: float, limit: int = 10) -> list[tuple[str, int]]:
+    """Return the most played artists since a time, as (artist, plays).
+
+    A play is a start of a track other than the one the player started
+    last, so pausing and resuming does not count twice.
+    """
+    last: dict[str, tuple[str, str]] = {}
+    plays: dict[str, int] = {}
+    for _, kind, player, artist, title in log.events(log.segments(since), since):
+        if kind != "+" or last.get(player) == (artist, title):
+            continue
+        last[player] = (artist, title)
+        if artist:
+            plays[artist] = plays.get(artist, 0) + 1
+    return sorted(plays.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+def player_time(log: HistoryLog, since: float, now: float | None = None) -> list[tuple[str, float]]:
+    """Return seconds of playback per player since a time, most first.
+
+    A session runs from a start to the player's next start or stop.
+    Sessions still open count until ``now``; no session counts for more
+    than ``_MAX_SESSION``.
+    """
+    now = time.time() if now is None else now
+    # Sessions may have started before the window
+    lookback = since - _MAX_SESSION
+    started: dict[str, int] = {}
+    totals: dict[str, float] = {}
+
+    def close(player: str, end: float) -> None:
+        start = started.pop(player, None)
+        if start is not None:
+            end = min(end, start + _MAX_SESSION)
+            totals[player] = totals.get(player, 0.0) + max(end - max(start, since), 0.0)
+
+    for ts, kind, player, _, _ in log.events(log.segments(lookback), lookback):
+        close(player, ts)
+        if kind == "+":
+            started[player] = ts
+    for player in list(started):
+        close(player, now)
+    return sorted(((p, t) for p, t in totals.items() if t > 0), key=lambda item: -item[1])
+
+
+def last_tracks(log: HistoryLog, limit: int = 10) -> list[tuple[int, str, str, str]]:
+    """Return the last started tracks, newest first, as (time, player, artist, title).
+
+    Reads segments from the newest back, only as far as needed.
+    """
+    from collections import deque
+
+    found: list[tuple[int, str, str, str]] = []
+    for path in reversed(log.segments()):
+        recent = deque(maxlen=limit - len(found))
+        for ts, kind, player, artist, title in log.events([path]):
+            if kind == "+":
+                recent.append((ts, player, artist, title))
+        found.extend(reversed(recent))
+        if len(found) >= limit:
+            break
+    return found
+
+
+def _format_duration(seconds: float) -> str:
+    minutes = int(seconds // 60)
+    return f"{minutes // 60}h {minutes % 60:02d}m"
+
+
+def format_history(query: str, rows: list[tuple]) -> str:
+    """Format the result of a ``history`` query as a table."""
+    if not rows:
+        return "No history recorded (enable with --history or MPRIS_ENHANCED_HISTORY=1)"
+    if query == "artists":
+        lines = [f"{'artist':<40} {'plays':>6}"]
+        lines += [f"{artist[:40]:<40} {plays:>6}" for artist, plays in rows]
+    elif query == "players":
+        lines = [f"{'player':<40} {'time':>8}"]
+        lines += [f"{player[:40]:<40} {_format_duration(seconds):>8}" for player, seconds in rows]
+    else:
+        lines = [f"{'started':<16} {'player':<12} track"]
+        for ts, player, artist, title in rows:
+            started = time.strftime("%Y-%m-%d %H:%M", time.localtime(ts))
+            track = f"{artist} - {title}" if artist else title
+            lines.append(f"{started:<16} {player[:12]:<12} {track}")
+    return "\n".join(lines)
@@ -2,42 +2,142 @@
 
 This module provides Waybar-compatible JSON output for displaying
 and controlling MPRIS media players.
+
+Waybar relaunches the module on every tick, so startup cost matters:
+common component invocations are parsed without argparse, and component
+modules and rarely used dependencies are imported only when needed.
 """
 
-import argparse
+import importlib
 import json
-import subprocess
-
-from . import __version__
-from .components import (
-    EndashComponent,
-    InfoComponent,
-    NextComponent,
-    PlayComponent,
-    PlayerIconComponent,
-    PrevComponent,
+import sys
+import time
+from types import SimpleNamespace
+
+from . import __version__, metrics
+from .components.base import Component, ComponentArgs
+from .constants import ADJUSTMENTS, CONTROL_ACTIONS
+from .playerctl import (
+    BACKENDS,
+    collect_players,
+    get_player_info,
+    pin_player,
+    resolve_best_player,
+    select_best_player,
+    set_backend,
+    set_cache_ttl,
+    set_fields,
+    set_time_budget,
 )
-from .components.base import ComponentArgs
-from .constants import PLAYER_ICONS, STATUS_ICONS
-from .playerctl import get_all_players, get_player_info, pin_player, run_playerctl, select_best_player
 
+# Component name -> (module in .components, class name), imported on demand
 COMPONENTS = {
-    "info": InfoComponent,
-    "player-icon": PlayerIconComponent,
-    "endash": EndashComponent,
-    "prev": PrevComponent,
-    "play": PlayComponent,
-    "next": NextComponent,
+    "info": ("info", "InfoComponent"),
+    "player-icon": ("info", "PlayerIconComponent"),
+    "endash": ("info", "EndashComponent"),
+    "prev": ("controls", "PrevComponent"),
+    "play": ("controls", "PlayComponent"),
+    "next": ("controls", "NextComponent"),
+    "progress": ("progress", "ProgressComponent"),
+    "players": ("players", "PlayersComponent"),
+}
+
+# 'history' queries: most played artists, playback time per player, and
+# the last started tracks
+HISTORY_QUERIES = ["artists", "players", "tracks"]
+
+SUBCOMMANDS = ["select-player", "pick", "control", "volume", "seek", "cover", "history", "serve", "stats"]
+
+_DEFAULTS = {
+    "component": "info",
+    "action": None,
+    "scroll": False,
+    "max_length": 25,
+    "scroll_speed": 1,
+    "backend": None,
+    "cache_ttl": None,
+    "budget": None,
+    "metrics": None,
+    "history": None,
+    "limit": 10,
+    "days": 7.0,
+    "json": False,
+    "reset": False,
+    "follow": False,
+    "interval": 1.0,
 }
 
 
-def parse_args() -> argparse.Namespace:
+def load_component(name: str) -> type[Component]:
+    """Import and return the component class registered under a name.
+
+    Raises:
+        KeyError: If no component is registered under ``name``.
+    """
+    module_name, class_name = COMPONENTS[name]
+    module = importlib.import_module(f".components.{module_name}", __package__)
+    return getattr(module, class_name)
+
+
+def _fast_parse(argv: list[str]) -> SimpleNamespace | None:
+    """Parse the common component invocations without argparse.
+
+    Handles ``[component] [--scroll] [--max-length N] [--scroll-speed N]``,
+    ``control <action>``, ``volume|seek <delta>`` and ``cover``.
+
+    Returns:
+        The parsed arguments, or None for anything else so that the full
+        parser (with its help and error messages) takes over.
+    """
+    values = dict(_DEFAULTS)
+    if len(argv) == 2 and argv[0] == "control" and argv[1] in CONTROL_ACTIONS:
+        values.update(component="control", action=argv[1])
+        return SimpleNamespace(**values)
+    if argv == ["cover"]:
+        values.update(component="cover")
+        return SimpleNamespace(**values)
+    if len(argv) == 2 and argv[0] in ADJUSTMENTS:
+        delta = _parse_delta(argv[1])
+        if delta is None:
+            return None
+        values.update(component=argv[0], action=argv[1])
+        return SimpleNamespace(**values)
+
+    component = None
+    args = iter(argv)
+    for arg in args:
+        if arg in COMPONENTS and component is None:
+            component = values["component"] = arg
+        elif arg == "--scroll":
+            values["scroll"] = True
+        elif arg in ("--max-length", "--scroll-speed"):
+            value = next(args, "")
+            if not value.isdigit():
+                return None
+            values[arg[2:].replace("-", "_")] = int(value)
+        else:
+            return None
+    return SimpleNamespace(**values)
+
+
+def parse_args(argv: list[str] | None = None) -> SimpleNamespace:
     """Parse command line arguments.
 
+    Args:
+        argv: Arguments to parse. Defaults to ``sys.argv[1:]``.
+
     Returns:
-        argparse.Namespace: Parsed command line arguments containing component
+        SimpleNamespace: Parsed command line arguments containing component
             selection and display options.
     """
+    if argv is None:
+        argv = sys.argv[1:]
+    fast = _fast_parse(argv)
+    if fast is not None:
+        return fast
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Enhanced Waybar MPRIS module",
         prog="waybar-mpris-enhanced",
@@ -50,9 +150,15 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "component",
         nargs="?",
-        default="info",
-        choices=list(COMPONENTS.keys()) + ["select-player", "pick"],
-        help="Component to display, or 'select-player'/'pick' for player selection",
+        default=_DEFAULTS["component"],
+        choices=list(COMPONENTS.keys()) + SUBCOMMANDS,
+        help="Component to display, 'select-player'/'pick' for player selection, 'control' to send a playback action, 'volume'/'seek' to change volume (percent) or position (seconds) by a delta such as +5 or -5, 'cover' to print the path of the cover art thumbnail, 'history' to query the listening history, 'serve' to run the shared render server, or 'stats' to show recorded metrics",
+    )
+    parser.add_argument(
+        "action",
+        nargs="?",
+        default=_DEFAULTS["action"],
+        help=f"Action for 'control': {', '.join(CONTROL_ACTIONS)}; delta for 'volume'/'seek'; query for 'history': {', '.join(HISTORY_QUERIES)}",
     )
     parser.add_argument(
         "--scroll",
@@ -62,38 +168,135 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--max-length",
         type=int,
-        default=25,
+        default=_DEFAULTS["max_length"],
         help="Maximum text length before truncating/scrolling (default: 25)",
     )
     parser.add_argument(
         "--scroll-speed",
         type=int,
-        default=1,
+        default=_DEFAULTS["scroll_speed"],
         help="Number of characters to scroll per update (default: 1)",
     )
+    parser.add_argument(
+        "--backend",
+        choices=list(BACKENDS.keys()),
+        default=None,
+        help="Player state backend (default: $MPRIS_ENHANCED_BACKEND or playerctl)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=None,
+        help="Seconds collected player state is shared between invocations; 0 disables (default: $MPRIS_ENHANCED_CACHE_TTL or 0.5)",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=None,
+        help="Seconds one invocation may spend waiting on playerctl; 0 disables (default: $MPRIS_ENHANCED_BUDGET or 2)",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        default=None,
+        help="Record call latencies and counts for 'stats' (default: $MPRIS_ENHANCED_METRICS)",
+    )
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        default=None,
+        help="Record track starts and stops for 'history' (default: $MPRIS_ENHANCED_HISTORY)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=_DEFAULTS["limit"],
+        help="Rows shown by 'history artists' and 'history tracks' (default: 10)",
+    )
+    parser.add_argument(
+        "--days",
+        type=float,
+        default=_DEFAULTS["days"],
+        help="Days covered by 'history artists' and 'history players' (default: 7)",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print 'stats' or 'history' as JSON instead of a table",
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Clear recorded stats after printing them ('stats' only)",
+    )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Stay running and print a new line only when the output changes",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=_DEFAULTS["interval"],
+        help="Seconds between scroll frames and state checks in --follow mode (default: 1)",
+    )
 
-    return parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.component == "control" and args.action not in CONTROL_ACTIONS:
+        parser.error(f"control requires an action: {', '.join(CONTROL_ACTIONS)}")
+    elif args.component == "history" and args.action not in (None, *HISTORY_QUERIES):
+        parser.error(f"history query must be one of: {', '.join(HISTORY_QUERIES)}")
+    elif args.component in ADJUSTMENTS and _parse_delta(args.action) is None:
+        parser.error(f"{args.component} requires a delta such as +5 or -5")
+    elif args.component not in ("control", "history", *ADJUSTMENTS) and args.action is not None:
+        parser.error(f"unrecognized arguments: {args.action}")
+    if args.limit < 1:
+        parser.error("--limit must be at least 1")
+    return SimpleNamespace(**vars(args))
+
+
+def _parse_delta(value: str | None) -> float | None:
+    """Parse a ``volume``/``seek`` delta such as ``+5``, ``-2.5`` or ``5``."""
+    try:
+        delta = float(value)
+    except (TypeError, ValueError):
+        return None
+    return delta if delta == delta and abs(delta) != float("inf") else None
+
+
+# Overall time budget for gathering the picker's player list.
+_PICKER_DEADLINE = 1.0
 
 
 def _run_picker() -> None:
-    """Show a walker dmenu listing all active players; pin the selection."""
-    players = get_all_players()
+    """Show a walker dmenu listing all active players; pin the selection.
+
+    All players are gathered with one batched query (or concurrently,
+    if a player hangs) under ``_PICKER_DEADLINE``. Players that miss the
+    deadline are still listed with a placeholder label.
+    """
+    import subprocess
+
+    from .constants import PLAYER_ICONS, STATUS_ICONS
+
+    players = collect_players(timeout=_PICKER_DEADLINE)
     if not players:
         return
 
-    current = select_best_player()
+    current = resolve_best_player(players)
     entries = []
-    for player, status in players:
-        player_icon = PLAYER_ICONS.get(player.lower().split(".")[0], PLAYER_ICONS["default"])
-        status_icon = STATUS_ICONS.get(status, STATUS_ICONS["default"])
-        title = run_playerctl(["--player", player, "metadata", "--format", "{{title}}"]) or "Unknown"
-        artist = run_playerctl(["--player", player, "metadata", "--format", "{{artist}}"]) or ""
-        label = f"{player_icon}  {player.title()}   {status_icon} {status.capitalize()}   {title}"
-        if artist:
-            label += f"  —  {artist}"
+    for p in players:
+        player_icon = PLAYER_ICONS.get(p.player.lower().split(".")[0], PLAYER_ICONS["default"])
+        if p.status == "unknown":
+            entries.append(f"{player_icon}  {p.player.title()}   (not responding)")
+            continue
+        status_icon = STATUS_ICONS.get(p.status, STATUS_ICONS["default"])
+        label = f"{player_icon}  {p.player.title()}   {status_icon} {p.status.capitalize()}   {p.title or 'Unknown'}"
+        if p.artist:
+            label += f"  —  {p.artist}"
         entries.append(label)
 
-    current_index = next((i for i, (p, _) in enumerate(players) if p == current), 0)
+    current_index = players.index(current)
 
     try:
         result = subprocess.run(
@@ -111,11 +314,26 @@ def _run_picker() -> None:
 
     try:
         index = int(result.stdout.strip())
-        pin_player(players[index][0])
+        pin_player(players[index].player)
     except (ValueError, IndexError):
         pass
 
 
+def _run_history(query: str, limit: int, days: float, as_json: bool) -> None:
+    """Print the result of a listening history query."""
+    from . import history
+
+    log = history.get_log()
+    since = time.time() - days * 86400
+    if query == "artists":
+        rows = history.top_artists(log, since, limit)
+    elif query == "players":
+        rows = history.player_time(log, since)
+    else:
+        rows = history.last_tracks(log, limit)
+    print(json.dumps(rows, indent=2) if as_json else history.format_history(query, rows))
+
+
 def main() -> None:
     """Main entry point for the MPRIS enhanced module.
 
@@ -125,6 +343,23 @@ def main() -> None:
     The function exits with status 0 on success.
     """
     args = parse_args()
+    try:
+        set_fields(None)
+    except ValueError as e:
+        sys.exit(f"config: {e}")
+    set_backend(args.backend)
+    set_cache_ttl(args.cache_ttl)
+    metrics.enable(args.metrics)
+    if args.history is not None:
+        from . import history
+
+        history.enable(args.history)
+    if args.component != "stats":
+        metrics.record_invocation(args.component)
+    # Actions have no tick to keep up with: a scroll burst's leader sends
+    # for as long as notches arrive
+    if args.component not in ("serve", "control", *ADJUSTMENTS) and not args.follow:
+        set_time_budget(args.budget)
 
     component_args = ComponentArgs(
         scroll=args.scroll,
@@ -141,11 +376,55 @@ def main() -> None:
         _run_picker()
         return
 
-    component_class = COMPONENTS[args.component]
-    component = component_class(component_args)
+    if args.component == "control":
+        from .control import run_control
+
+        if not run_control(args.action):
+            sys.exit(1)
+        return
+
+    if args.component in ADJUSTMENTS:
+        from .adjust import run_adjust
+
+        if not run_adjust(args.component, _parse_delta(args.action)):
+            sys.exit(1)
+        return
+
+    if args.component == "cover":
+        from .artwork import get_cover_path
+
+        print(get_cover_path() or "")
+        return
+
+    if args.component == "history":
+        _run_history(args.action or "tracks", args.limit, args.days, args.json)
+        return
+
+    if args.component == "stats":
+        stats = metrics.load_stats()
+        print(json.dumps(stats, indent=2) if args.json else metrics.format_stats(stats))
+        if args.reset:
+            metrics.reset_stats()
+        return
+
+    if args.component == "serve":
+        from .server import serve
+
+        serve(load_component, parse_args)
+        return
+
+    component = load_component(args.component)(component_args)
+
+    if args.follow:
+        from .follow import follow
+
+        follow(component, args.interval)
+        return
 
     info = get_player_info()
+    start = time.perf_counter()
     output = component.render(info)
+    metrics.record_render(args.component, time.perf_counter() - start)
 
     print(json.dumps(output.to_dict()))
 
@@ -0,0 +1,229 @@
+"""Opt-in instrumentation for MPRIS module.
+
+When enabled (``--metrics`` or ``MPRIS_ENHANCED_METRICS=1``), playerctl
+call latencies, timeouts and failures, component render times and
+invocation counts are aggregated in memory and merged into a small
+persistent stats file under ``$XDG_STATE_HOME`` when the process exits
+(and periodically in resident modes). When disabled, every recording
+function returns immediately.
+"""
+
+__all__ = [
+    "enable",
+    "is_enabled",
+    "record_playerctl",
+    "record_render",
+    "record_invocation",
+    "record_event",
+    "flush",
+    "load_stats",
+    "reset_stats",
+    "format_stats",
+]
+
+import atexit
+import fcntl
+import os
+import time
+
+from .utils import get_state_dir, load_json, save_json
+
+# Upper bounds (ms) of the latency histogram buckets; the last is open.
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+# Resident processes merge their counters at most this often.
+_FLUSH_INTERVAL = 60.0
+
+_enabled = False
+_pending: dict = {}
+_last_flush = 0.0
+
+
+def enable(flag: bool | None = None) -> None:
+    """Turn instrumentation on or off.
+
+    Args:
+        flag: True/False to force the setting, or None to read
+            ``$MPRIS_ENHANCED_METRICS`` (enabled for any non-empty value
+            other than ``0``).
+    """
+    global _enabled, _last_flush
+    if flag is None:
+        flag = os.environ.get("MPRIS_ENHANCED_METRICS", "0") not in ("", "0")
+    if flag and not _enabled:
+        _last_flush = time.monotonic()
+        atexit.register(flush)
+    _enabled = flag
+
+
+def is_enabled() -> bool:
+    """Return whether instrumentation is currently enabled."""
+    return _enabled
+
+
+def _get_stats_path() -> str:
+    return os.path.join(get_state_dir(), "stats.json")
+
+
+def _new_histogram() -> dict:
+    return {"count": 0, "sum_ms": 0.0, "max_ms": 0.0, "buckets": [0] * (len(BUCKETS_MS) + 1)}
+
+
+def _observe(hist: dict, ms: float) -> None:
+    """Add one latency sample to a histogram."""
+    hist["count"] += 1
+    hist["sum_ms"] += ms
+    hist["max_ms"] = max(hist["max_ms"], ms)
+    index = next((i for i, bound in enumerate(BUCKETS_MS) if ms <= bound), len(BUCKETS_MS))
+    hist["buckets"][index] += 1
+
+
+def _maybe_flush() -> None:
+    if time.monotonic() - _last_flush >= _FLUSH_INTERVAL:
+        flush()
+
+
+def record_playerctl(subcommand: str, seconds: float, outcome: str) -> None:
+    """Record one playerctl invocation.
+
+    Args:
+        subcommand: playerctl subcommand (e.g. 'metadata', 'status').
+        seconds: Wall time the call took.
+        outcome: 'ok', 'failed', 'crashed' or 'timeout'. Crashes count
+            as failures.
+    """
+    if not _enabled:
+        return
+    entry = _pending.setdefault("playerctl", {}).setdefault(subcommand, {**_new_histogram(), "failures": 0, "timeouts": 0})
+    _observe(entry, seconds * 1000)
+    if outcome in ("failed", "crashed"):
+        entry["failures"] += 1
+    elif outcome == "timeout":
+        entry["timeouts"] += 1
+    _maybe_flush()
+
+
+def record_render(component: str, seconds: float) -> None:
+    """Record the time taken to render one component."""
+    if not _enabled:
+        return
+    _observe(_pending.setdefault("render", {}).setdefault(component, _new_histogram()), seconds * 1000)
+    _maybe_flush()
+
+
+def record_invocation(name: str) -> None:
+    """Count one invocation of a component or subcommand."""
+    if not _enabled:
+        return
+    invocations = _pending.setdefault("invocations", {})
+    invocations[name] = invocations.get(name, 0) + 1
+
+
+def record_event(name: str, count: int = 1) -> None:
+    """Count a named event (e.g. a cache hit)."""
+    if not _enabled:
+        return
+    events = _pending.setdefault("events", {})
+    events[name] = events.get(name, 0) + count
+
+
+def _merge_hist(into: dict, src: dict) -> None:
+    for key, value in src.items():
+        if key == "buckets":
+            into[key] = [a + b for a, b in zip(into.get(key, [0] * len(value)), value)]
+        elif key == "max_ms":
+            into[key] = max(into.get(key, 0.0), value)
+        else:
+            into[key] = into.get(key, 0) + value
+
+
+def _merge(stats: dict, pending: dict) -> None:
+    """Merge pending counters into the persisted stats in place."""
+    for section in ("playerctl", "render"):
+        for name, hist in pending.get(section, {}).items():
+            _merge_hist(stats.setdefault(section, {}).setdefault(name, {}), hist)
+    for section in ("invocations", "events"):
+        for name, count in pending.get(section, {}).items():
+            counts = stats.setdefault(section, {})
+            counts[name] = counts.get(name, 0) + count
+
+
+def load_stats() -> dict:
+    """Return the persisted stats, or an empty dict if none exist."""
+    return load_json(_get_stats_path(), {})
+
+
+def flush() -> None:
+    """Merge in-memory counters into the stats file under an exclusive lock."""
+    global _pending, _last_flush
+    _last_flush = time.monotonic()
+    if not _pending:
+        return
+
+    path = _get_stats_path()
+    try:
+        with open(path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            stats = load_stats()
+            stats.setdefault("since", time.time())
+            stats["updated"] = time.time()
+            _merge(stats, _pending)
+            if not save_json(path, stats):
+                return
+    except OSError:
+        return
+    _pending = {}
+
+
+def reset_stats() -> None:
+    """Delete the persisted stats."""
+    import contextlib
+
+    with contextlib.suppress(OSError):
+        os.remove(_get_stats_path())
+
+
+def _percentile(hist: dict, q: float) -> float:
+    """Estimate a percentile as the upper bound of the bucket reaching it."""
+    target = q * hist["count"]
+    seen = 0
+    for bound, count in zip(BUCKETS_MS, hist["buckets"]):
+        seen += count
+        if seen >= target:
+            return min(bound, hist["max_ms"])
+    return hist["max_ms"]
+
+
+def format_stats(stats: dict) -> str:
+    """Format persisted stats as a human-readable table."""
+    if not stats:
+        return "No stats recorded (enable with --metrics or MPRIS_ENHANCED_METRICS=1)"
+
+    elapsed_min = max((stats["updated"] - stats["since"]) / 60, 1 / 60)
+    spawns = sum(h["count"] for h in stats.get("playerctl", {}).values())
+    invocations = sum(stats.get("invocations", {}).values())
+    since = time.strftime("%Y-%m-%d %H:%M", time.localtime(stats["since"]))
+    lines = [
+        f"Since {since}: {invocations} invocations, {spawns} playerctl calls ({spawns / elapsed_min:.1f}/min)",
+        "",
+        f"{'playerctl':<20} {'calls':>7} {'fail':>6} {'tmout':>6} {'mean ms':>8} {'p50':>7} {'p95':>7} {'max':>7}",
+    ]
+    for name, h in sorted(stats.get("playerctl", {}).items()):
+        lines.append(
+            f"{name:<20} {h['count']:>7} {h['failures']:>6} {h['timeouts']:>6} {h['sum_ms'] / h['count']:>8.1f}"
+            f" {_percentile(h, 0.5):>7.1f} {_percentile(h, 0.95):>7.1f} {h['max_ms']:>7.1f}"
+        )
+
+    lines += ["", f"{'render':<20} {'calls':>7} {'mean ms':>8} {'p50':>7} {'p95':>7} {'max':>7}"]
+    for name, h in sorted(stats.get("render", {}).items()):
+        lines.append(
+            f"{name:<20} {h['count']:>7} {h['sum_ms'] / h['count']:>8.2f}"
+            f" {_percentile(h, 0.5):>7.1f} {_percentile(h, 0.95):>7.1f} {h['max_ms']:>7.2f}"
+        )
+
+    lines += ["", f"{'invocations':<20} {'count':>7}"]
+    lines += [f"{name:<20} {count:>7}" for name, count in sorted(stats.get("invocations", {}).items())]
+    if stats.get("events"):
+        lines += ["", f"{'events':<20} {'count':>7}"]
+        lines += [f"{name:<20} {count:>7}" for name, count in sorted(stats["events"].items())]
+    return "\n".join(lines)
@@ -1,14 +1,51 @@
 """Playerctl interaction for MPRIS module.
 
 This module handles all communication with playerctl to retrieve
-information about active MPRIS media players.
+information about active MPRIS media players. Player state is read
+through a pluggable ``Backend``: playerctl (default), native D-Bus, or
+an in-process fake used for testing.
 """
 
-__all__ = ["PlayerInfo", "run_playerctl", "select_best_player", "get_player_info", "get_all_players", "pin_player", "get_pinned_player"]
+__all__ = [
+    "PlayerInfo",
+    "Backend",
+    "PlayerctlBackend",
+    "DBusBackend",
+    "FakeBackend",
+    "BACKENDS",
+    "get_backend",
+    "set_backend",
+    "set_cache_ttl",
+    "run_playerctl",
+    "collect_players",
+    "collect_players_async",
+    "rank_players",
+    "resolve_best_player",
+    "select_best_player",
+    "get_player_info",
+    "get_all_players",
+    "pin_player",
+    "get_pinned_player",
+    "get_pin_mtime",
+    "get_skipped_players",
+    "get_collected_players",
+    "get_reported_name",
+    "set_time_budget",
+    "set_fields",
+]
 
+import json
 import os
-import subprocess
-from dataclasses import dataclass
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, replace
+
+from . import metrics
+from .cache import SnapshotCache
+from .utils import get_runtime_dir
+
+# ranking.py and breaker.py are imported where players are actually
+# queried, keeping ticks served from the snapshot cache cheap.
 
 _PIN_FILE = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "waybar-mpris-pinned")
 
@@ -22,19 +59,151 @@ class PlayerInfo:
         title: Title of the currently playing track.
         artist: Artist name of the currently playing track.
         status: Playback status ('playing', 'paused', or 'stopped').
+        length: Track length in seconds (0 if unknown).
+        position: Playback position in seconds at collection time.
+        rate: Playback rate (1.0 is normal speed). Only the D-Bus
+            backend reports it; playerctl has no format variable for it,
+            so other backends report 1.0.
+        album: Album of the current track. Only fetched when an output
+            template uses it (see ``set_fields``); empty otherwise.
     """
 
     player: str
     title: str
     artist: str
     status: str
+    length: float = 0.0
+    position: float = 0.0
+    rate: float = 1.0
+    album: str = ""
+
+
+# Default time limit for a single playerctl call, in seconds.
+DEFAULT_TIMEOUT = 2.0
+
+_DEFAULT_BUDGET = 2.0
+
+# Monotonic time after which no more playerctl calls are started
+_budget_deadline: float | None = None
+
+
+def set_time_budget(budget: float | None) -> None:
+    """Bound the total time this invocation may spend waiting on playerctl.
+
+    Every later playerctl call is given at most the remaining budget;
+    once it is used up, calls fail immediately as timeouts. Resident
+    modes should not set a budget.
+
+    Args:
+        budget: Seconds from now, or None to use ``$MPRIS_ENHANCED_BUDGET``
+            (default: 2). A value of 0 or less removes the limit.
+    """
+    global _budget_deadline
+    if budget is None:
+        try:
+            budget = float(os.environ.get("MPRIS_ENHANCED_BUDGET", _DEFAULT_BUDGET))
+        except ValueError:
+            budget = _DEFAULT_BUDGET
+    _budget_deadline = time.monotonic() + budget if budget > 0 else None
+
+
+# Outcomes blamed on a player rather than on playerctl or the setup: the
+# batched call falls back to per-player queries and the breaker counts them
+_UNRESPONSIVE = ("timeout", "crashed")
+
+
+def _clamp_timeout(timeout: float, start: float) -> float:
+    """Limit a call's timeout to what is left of the time budget."""
+    if _budget_deadline is not None:
+        timeout = min(timeout, _budget_deadline - start)
+    return timeout
+
+
+def _exec_playerctl(args: list[str], timeout: float) -> tuple[str | None, str]:
+    """Run playerctl and report how the call ended.
+
+    Returns:
+        Tuple of (stripped stdout or None, outcome), where outcome is
+        'ok', 'failed', 'crashed' (killed by a signal) or 'timeout'.
+    """
+    import subprocess
+
+    start = time.monotonic()
+    timeout = _clamp_timeout(timeout, start)
+    if timeout <= 0:
+        return None, "timeout"
+    outcome = "failed"
+    try:
+        result = subprocess.run(
+            ["playerctl"] + args,
+            capture_output=True,
+            text=True,
+            timeout=max(timeout, 0.01),
+        )
+        if result.returncode != 0:
+            outcome = "crashed" if result.returncode < 0 else outcome
+            return None, outcome
+        outcome = "ok"
+        return result.stdout.strip(), outcome
+    except subprocess.TimeoutExpired:
+        outcome = "timeout"
+        return None, outcome
+    except OSError:
+        return None, outcome
+    finally:
+        if metrics.is_enabled():
+            metrics.record_playerctl(_subcommand(args), time.monotonic() - start, outcome)
 
 
-def run_playerctl(args: list[str]) -> str | None:
+async def _exec_playerctl_async(args: list[str], timeout: float) -> tuple[str | None, str]:
+    """Asynchronous ``_exec_playerctl``.
+
+    The process is killed when the timeout expires or the awaiting task
+    is cancelled, so abandoned queries never outlive the collection.
+    """
+    import asyncio
+    import subprocess
+
+    start = time.monotonic()
+    timeout = _clamp_timeout(timeout, start)
+    if timeout <= 0:
+        return None, "timeout"
+    outcome = "failed"
+    proc = None
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "playerctl",
+            *args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        stdout, _ = await asyncio.wait_for(proc.communicate(), max(timeout, 0.01))
+        if proc.returncode != 0:
+            outcome = "crashed" if proc.returncode < 0 else outcome
+            return None, outcome
+        outcome = "ok"
+        return stdout.decode(errors="replace").strip(), outcome
+    except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+        outcome = "timeout"
+        if proc is not None and proc.returncode is None:
+            proc.kill()
+            await asyncio.shield(proc.wait())
+        if isinstance(e, asyncio.CancelledError):
+            raise
+        return None, outcome
+    except OSError:
+        return None, outcome
+    finally:
+        if metrics.is_enabled():
+            metrics.record_playerctl(_subcommand(args), time.monotonic() - start, outcome)
+
+
+def run_playerctl(args: list[str], timeout: float = DEFAULT_TIMEOUT) -> str | None:
     """Run playerctl command and return output.
 
     Args:
         args: List of command line arguments to pass to playerctl.
+        timeout: Seconds to wait for playerctl before giving up.
 
     Returns:
         The stripped stdout from playerctl if successful, None if the command
@@ -44,28 +213,84 @@ def run_playerctl(args: list[str]) -> str | None:
         >>> run_playerctl(['metadata', '--format', '{{title}}'])
         'Song Title'
     """
-    try:
-        result = subprocess.run(
-            ["playerctl"] + args,
-            capture_output=True,
-            text=True,
-            timeout=2,
-        )
-        return result.stdout.strip() if result.returncode == 0 else None
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        return None
+    return _exec_playerctl(args, timeout)[0]
 
 
-_STATUS_PRIORITY = {"playing": 0, "paused": 1, "stopped": 2}
+# playerctl options that take a value, skipped when naming a subcommand.
+_VALUE_OPTIONS = {"-p", "--player", "-i", "--ignore-player", "-f", "--format"}
 
-# Browsers that embed media players — deprioritized vs dedicated music apps.
-_BROWSER_PLAYERS = {"firefox", "chromium", "chrome", "google-chrome", "brave", "opera", "vivaldi", "epiphany"}
 
+def _subcommand(args: list[str]) -> str:
+    """Return the playerctl subcommand of an argument list, for metrics."""
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg in _VALUE_OPTIONS:
+            skip = True
+        elif arg in ("-l", "--list-all"):
+            return "list"
+        elif not arg.startswith("-"):
+            return arg
+    return "-"
 
-def _player_type_priority(player_name: str) -> int:
-    """Return 0 for dedicated music apps, 1 for browsers."""
-    return 1 if player_name.lower().split(".")[0] in _BROWSER_PLAYERS else 0
 
+# PlayerInfo attribute -> playerctl metadata key, for the fields fetched
+# for every player by the batched query, in output order. The unit
+# separator keeps titles containing tabs or pipes intact.
+_FIELD_SEP = "\x1f"
+_BATCH_FIELDS = {
+    "player": "playerInstance",
+    "status": "status",
+    "title": "title",
+    "artist": "artist",
+    "length": "mpris:length",
+    "position": "position",
+}
+
+# Metadata that is only fetched when an output template references it.
+_OPTIONAL_FIELDS = {"album": "xesam:album"}
+
+_fields: tuple[str, ...] | None = None
+_batch: tuple[tuple[str, ...], str] | None = None
+
+
+def set_fields(fields: set[str] | None) -> None:
+    """Select which optional metadata fields backends fetch.
+
+    Args:
+        fields: PlayerInfo attributes that are needed, or None for the
+            ones referenced by the output templates (see ``formats.py``).
+
+    Raises:
+        ValueError: If fields is None and the configured templates are
+            invalid.
+    """
+    global _fields, _batch
+    if fields is None:
+        from .formats import get_template_fields
+
+        fields = get_template_fields()
+    _fields = tuple(f for f in _OPTIONAL_FIELDS if f in fields)
+    attributes = (*_BATCH_FIELDS, *_fields)
+    keys = [*_BATCH_FIELDS.values(), *(_OPTIONAL_FIELDS[f] for f in _fields)]
+    _batch = attributes, _FIELD_SEP.join("{{" + k + "}}" for k in keys)
+
+
+def _get_fields() -> tuple[str, ...]:
+    """Return the optional fields to fetch, selecting them on first use."""
+    if _fields is None:
+        try:
+            set_fields(None)
+        except ValueError:
+            set_fields(set())
+    return _fields
+
+
+def _batch_format() -> tuple[tuple[str, ...], str]:
+    """Return the attributes and ``--format`` template of a batched query."""
+    _get_fields()
+    return _batch
 
 def pin_player(player: str | None) -> None:
     """Persist a manually selected player to the pin state file."""
@@ -88,69 +313,703 @@ def get_pinned_player() -> str | None:
         return None
 
 
-def get_all_players() -> list[tuple[str, str]]:
-    """Return list of (player_name, status) for all active players."""
-    players_output = run_playerctl(["-l"])
-    if not players_output:
-        return []
+def _parse_microseconds(value: str) -> float:
+    """Convert an MPRIS microsecond value to seconds (0 if missing)."""
+    try:
+        return max(int(value), 0) / 1_000_000
+    except ValueError:
+        return 0.0
 
-    result = []
-    for player in [p.strip() for p in players_output.splitlines() if p.strip()]:
-        status = run_playerctl(["--player", player, "status"])
-        if status is not None:
-            result.append((player, status.lower()))
 
-    result.sort(key=lambda x: (_STATUS_PRIORITY.get(x[1], 99), _player_type_priority(x[0])))
-    return result
+def _placeholder(player: str) -> PlayerInfo:
+    """Return a record for a player that could not be queried in time."""
+    return PlayerInfo(player=player, title="", artist="", status="unknown")
 
 
-def select_best_player() -> str | None:
-    """Select the best player based on playback status and player type.
+def _get_breaker():
+    """Return the per-player ``CircuitBreaker``, loaded fresh from disk."""
+    from .breaker import CircuitBreaker
+
+    return CircuitBreaker(os.path.join(get_runtime_dir(), "breaker.json"))
+
+
+def get_skipped_players() -> list[str]:
+    """Return players that did not answer in the last collection.
+
+    These are the placeholders (status 'unknown') reported by the last
+    ``collect_players`` call, which includes the players skipped by the
+    circuit breaker. Reading them costs nothing, so renderers may call
+    this on every frame.
+    """
+    return _unresponsive
+
+
+def get_collected_players() -> list[PlayerInfo]:
+    """Return the ranked players of the last ``collect_players`` call.
+
+    Components that show every player render from this instead of
+    collecting again, so they cost no extra backend queries.
+    """
+    return _collected
+
+
+def get_reported_name(player: str) -> str:
+    """Return a player's name as the backend reported it.
+
+    ``get_player_info`` lowercases player names, but ``playerctl
+    --player`` and D-Bus bus names are case-sensitive. This looks the
+    name up in the last collection, falling back to ``player``.
+    """
+    lowered = player.lower()
+    return next((p.player for p in _collected if p.player.lower() == lowered), player)
+
+
+def _parse_listing(output: str | None) -> list[str]:
+    """Return the unique player names of ``playerctl -l`` output."""
+    return list(dict.fromkeys(p.strip() for p in (output or "").splitlines() if p.strip()))
+
+
+def _parse_batch(output: str, attributes: tuple[str, ...]) -> list[PlayerInfo]:
+    """Parse batched ``--all-players metadata`` output into PlayerInfo records.
+
+    Each line holds the values of ``attributes`` (see ``_batch_format``)
+    separated by ``_FIELD_SEP``. Malformed lines are skipped. Player
+    names are kept verbatim (including any instance suffix) so they can
+    be passed back to ``playerctl --player``.
+    """
+    players = []
+    seen = set()
+    for line in output.splitlines():
+        values = line.split(_FIELD_SEP)
+        if len(values) != len(attributes):
+            continue
+        record = dict(zip(attributes, (v.strip() for v in values)))
+        if not record["player"] or record["player"] in seen:
+            continue
+        seen.add(record["player"])
+        record["status"] = record["status"].lower() or "stopped"
+        record["length"] = _parse_microseconds(record["length"])
+        record["position"] = _parse_microseconds(record["position"])
+        players.append(PlayerInfo(**record))
+    return players
+
+
+# Ranking of this process, created on first use
+_ranking = None
+
+
+def rank_players(players: list[PlayerInfo]) -> list[PlayerInfo]:
+    """Order players best-first by the configured ranking policy.
+
+    See ``ranking.py`` for the policy. Ignored players are dropped.
+    Within one process the order is kept between calls and updated
+    incrementally for the players whose state changed.
+    """
+    global _ranking
+    if _ranking is None:
+        from .ranking import Ranking, get_policy
+
+        _ranking = Ranking(get_policy())
+    return _ranking.update(players)
+
+
+class Backend(ABC):
+    """Source of MPRIS player state.
+
+    Backends only report raw player state; ranking and pin resolution
+    are shared and happen in ``collect_players``.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def collect(self, timeout: float = DEFAULT_TIMEOUT) -> list[PlayerInfo]:
+        """Return the state of every active player, in no particular order.
+
+        Player names are kept verbatim (including any instance suffix) so
+        they can be passed back to ``playerctl --player``.
+
+        Args:
+            timeout: Overall time budget in seconds. Players that cannot
+                be queried in time are reported with status 'unknown' and
+                empty metadata where the backend can still list them.
+        """
+        ...
+
+    async def collect_async(self, timeout: float = DEFAULT_TIMEOUT) -> list[PlayerInfo]:
+        """Asynchronous ``collect``.
+
+        Backends without a native implementation run ``collect`` in a
+        worker thread.
+        """
+        import asyncio
+
+        return await asyncio.to_thread(self.collect, timeout)
+
+    def get_position(self, player: str) -> float | None:
+        """Return a player's current playback position in seconds.
+
+        Args:
+            player: Player name as reported by ``collect``.
+
+        Returns:
+            The position, or None if it cannot be determined.
+        """
+        output = run_playerctl(["--player", player, "position"])
+        try:
+            return float(output) if output else None
+        except ValueError:
+            return None
+
+
+class PlayerctlBackend(Backend):
+    """Backend that reads player state by shelling out to playerctl.
+
+    Uses a single ``playerctl --all-players metadata --format`` call that
+    reports name, status, track metadata and position for each player.
+    Because the batched call queries players one after another, a single
+    hung player can stall it; if it times out, players are listed and
+    queried concurrently with asyncio subprocesses instead, and those
+    that miss the deadline are cancelled and reported as placeholders.
+    Players that keep timing out are skipped for a while by a persisted
+    circuit breaker (see ``breaker.py``), so one wedged player cannot
+    stall every tick.
+    """
+
+    name = "playerctl"
+
+    # Share of the budget given to the batched call before falling back
+    _BATCH_SHARE = 0.5
+    # Per-player queries running at once in the fallback
+    _MAX_CONCURRENT = 16
+    # Seconds past the deadline before unfinished queries are cancelled
+    _CANCEL_GRACE = 0.5
+    # Per-player queries are not started with less time than this left,
+    # so a healthy player is never blamed for a deadline it could not meet
+    _MIN_QUERY_TIME = 0.25
+
+    def _batch_args(self, skipped: list[str]) -> list[str]:
+        """Return the arguments of the batched query for every player."""
+        from .ranking import get_policy
+
+        args = ["--all-players", "metadata", "--format", _batch_format()[1]]
+        ignored = skipped + get_policy().ignored_names
+        if ignored:
+            args = ["--ignore-player", ",".join(ignored)] + args
+        return args
+
+    @staticmethod
+    def _finish_batch(output: str | None, skipped: list[str], breaker) -> list[PlayerInfo]:
+        """Parse the batched output and add placeholders for skipped players."""
+        players = _parse_batch(output, _batch_format()[0]) if output else []
+        for p in players:
+            breaker.record_success(p.player)
+        return players + [_placeholder(name) for name in skipped]
+
+    def _start(self, timeout: float) -> tuple[float, object, list[str], list[str]]:
+        """Begin a collection.
+
+        Returns:
+            The deadline, the circuit breaker, the players it skips and
+            the arguments of the batched call.
+        """
+        breaker = _get_breaker()
+        skipped = breaker.open_players()
+        return time.monotonic() + timeout, breaker, skipped, self._batch_args(skipped)
+
+    async def _complete(
+        self, deadline: float, breaker, skipped: list[str], output: str | None, outcome: str
+    ) -> list[PlayerInfo]:
+        """Finish a collection from the outcome of the batched call.
+
+        Falls back to per-player queries if the batched call timed out
+        or crashed. Skipped players are only reported (as placeholders)
+        while they are still running.
+        """
+        if outcome in _UNRESPONSIVE:
+            players = await self._collect_each(deadline, skipped, breaker)
+        else:
+            running = await self._still_running(deadline, skipped, breaker) if skipped else []
+            players = self._finish_batch(output, running, breaker)
+        return self._finish(players, breaker, skipped)
+
+    @staticmethod
+    async def _still_running(deadline: float, skipped: list[str], breaker) -> list[str]:
+        """Return the skipped players that are still running.
+
+        The batched call ignores skipped players, so they are looked up
+        with ``playerctl -l``. Players that are gone are dropped from the
+        breaker: they are no longer shown as not responding, and are
+        queried right away if they come back.
+        """
+        listing, outcome = await _exec_playerctl_async(["-l"], deadline - time.monotonic())
+        if outcome in _UNRESPONSIVE:
+            return skipped
+        # The listing fails when no player is running at all
+        names = set(_parse_listing(listing))
+        for name in skipped:
+            if name not in names:
+                breaker.forget(name)
+        return [name for name in skipped if name in names]
+
+    @staticmethod
+    def _finish(players: list[PlayerInfo], breaker, skipped: list[str]) -> list[PlayerInfo]:
+        """Save the breaker state and return the collected players."""
+        breaker.save()
+        if skipped:
+            metrics.record_event("breaker-skip", len(skipped))
+        return players
+
+    def collect(self, timeout: float = DEFAULT_TIMEOUT) -> list[PlayerInfo]:
+        deadline, breaker, skipped, args = self._start(timeout)
+        output, outcome = _exec_playerctl(args, timeout * self._BATCH_SHARE)
+        if outcome in _UNRESPONSIVE or skipped:
+            import asyncio
+
+            return asyncio.run(self._complete(deadline, breaker, skipped, output, outcome))
+        # Without the fallback or skipped players nothing is awaited: finish
+        # without an event loop, keeping the common case free of asyncio startup
+        return self._finish(self._finish_batch(output, skipped, breaker), breaker, skipped)
+
+    async def collect_async(self, timeout: float = DEFAULT_TIMEOUT) -> list[PlayerInfo]:
+        deadline, breaker, skipped, args = self._start(timeout)
+        output, outcome = await _exec_playerctl_async(args, timeout * self._BATCH_SHARE)
+        return await self._complete(deadline, breaker, skipped, output, outcome)
+
+    @staticmethod
+    async def _collect_each(deadline: float, skipped: list[str], breaker) -> list[PlayerInfo]:
+        """List players, then query each one concurrently until the deadline.
+
+        At most ``_MAX_CONCURRENT`` queries run at once. Queries still
+        running at the deadline time out, which kills their playerctl
+        process. Queries that would get a slot with less than
+        ``_MIN_QUERY_TIME`` left are not started. Only players whose
+        playerctl process was started and then timed out or crashed are
+        reported to the breaker; they, the players never queried and the
+        skipped players still listed are returned as placeholders. Skipped
+        players that are gone are dropped from the breaker.
+        """
+        import asyncio
+
+        from .ranking import get_policy
+
+        listing, outcome = await _exec_playerctl_async(["-l"], deadline - time.monotonic())
+        policy = get_policy()
+        names = _parse_listing(listing)
+        if outcome not in _UNRESPONSIVE:
+            for name in skipped:
+                if name not in names:
+                    breaker.forget(name)
+        names = [name for name in names if not policy.is_ignored(name)]
+        queried = [name for name in names if name not in skipped]
+        if not queried:
+            return [_placeholder(name) for name in names]
+
+        attributes, batch_format = _batch_format()
+        slots = asyncio.Semaphore(PlayerctlBackend._MAX_CONCURRENT)
+        started = set()
+
+        async def query(name: str) -> tuple[str | None, str]:
+            async with slots:
+                now = time.monotonic()
+                if _clamp_timeout(deadline - now, now) < PlayerctlBackend._MIN_QUERY_TIME:
+                    return None, "not started"
+                started.add(name)
+                args = ["--player", name, "metadata", "--format", batch_format]
+                return await _exec_playerctl_async(args, deadline - now)
+
+        # Each query times out at the deadline by itself; cancelling is only
+        # a last resort, as it can interrupt a spawn in progress
+        tasks = {name: asyncio.create_task(query(name)) for name in queried}
+        grace = max(deadline - time.monotonic(), 0) + PlayerctlBackend._CANCEL_GRACE
+        _, pending = await asyncio.wait(tasks.values(), timeout=grace)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        players = []
+        for name in names:
+            task = tasks.get(name)
+            if task is not None and not task.cancelled():
+                output, outcome = task.result()
+            else:
+                output, outcome = None, "timeout"
+            if name in started and outcome in _UNRESPONSIVE:
+                breaker.record_timeout(name)
+            elif outcome == "ok":
+                breaker.record_success(name)
+            parsed = _parse_batch(output, attributes) if output else []
+            players.append(parsed[0] if parsed else _placeholder(name))
+        return players
+
+
+class DBusBackend(Backend):
+    """Backend that talks to ``org.mpris.MediaPlayer2.*`` on the session bus.
+
+    All player properties are read in bulk with one ``GetAll`` call per
+    player, without spawning any process. Requires PyGObject (``gi``).
+
+    Raises:
+        ImportError: If PyGObject is not installed.
+    """
+
+    name = "dbus"
+
+    _BUS_PREFIX = "org.mpris.MediaPlayer2."
+    _OBJECT_PATH = "/org/mpris/MediaPlayer2"
+    _TIMEOUT_MS = 500
+
+    def __init__(self) -> None:
+        from gi.repository import Gio, GLib
+
+        self._gio = Gio
+        self._glib = GLib
+        self._bus = None
+
+    def _call(self, bus_name: str, path: str, interface: str, method: str, params, reply_type: str, timeout_ms: int):
+        """Invoke a D-Bus method synchronously and return the unpacked reply."""
+        if self._bus is None:
+            self._bus = self._gio.bus_get_sync(self._gio.BusType.SESSION, None)
+        reply = self._bus.call_sync(
+            bus_name,
+            path,
+            interface,
+            method,
+            params,
+            self._glib.VariantType(reply_type),
+            self._gio.DBusCallFlags.NONE,
+            timeout_ms,
+            None,
+        )
+        return reply.unpack()
+
+    def _remaining_ms(self, deadline: float) -> int:
+        """Return the per-call D-Bus timeout left before the deadline."""
+        return max(1, min(self._TIMEOUT_MS, int((deadline - time.monotonic()) * 1000)))
+
+    def collect(self, timeout: float = DEFAULT_TIMEOUT) -> list[PlayerInfo]:
+        deadline = time.monotonic() + timeout
+        try:
+            (names,) = self._call(
+                "org.freedesktop.DBus",
+                "/org/freedesktop/DBus",
+                "org.freedesktop.DBus",
+                "ListNames",
+                None,
+                "(as)",
+                self._remaining_ms(deadline),
+            )
+        except self._glib.Error:
+            return []
+
+        from .ranking import get_policy
+
+        policy = get_policy()
+        players = []
+        for bus_name in sorted(n for n in names if n.startswith(self._BUS_PREFIX)):
+            player = bus_name[len(self._BUS_PREFIX) :]
+            if policy.is_ignored(player):
+                continue
+            if time.monotonic() >= deadline:
+                players.append(_placeholder(player))
+                continue
+            try:
+                (props,) = self._call(
+                    bus_name,
+                    self._OBJECT_PATH,
+                    "org.freedesktop.DBus.Properties",
+                    "GetAll",
+                    self._glib.Variant("(s)", ("org.mpris.MediaPlayer2.Player",)),
+                    "(a{sv})",
+                    self._remaining_ms(deadline),
+                )
+            except self._glib.Error:
+                players.append(_placeholder(player))
+                continue
+            players.append(self._to_info(player, props))
+        return players
+
+    def get_position(self, player: str) -> float | None:
+        try:
+            (position,) = self._call(
+                self._BUS_PREFIX + player,
+                self._OBJECT_PATH,
+                "org.freedesktop.DBus.Properties",
+                "Get",
+                self._glib.Variant("(ss)", ("org.mpris.MediaPlayer2.Player", "Position")),
+                "(v)",
+                self._TIMEOUT_MS,
+            )
+        except self._glib.Error:
+            return None
+        return max(int(position), 0) / 1_000_000
+
+    @staticmethod
+    def _to_info(player: str, props: dict) -> PlayerInfo:
+        """Convert a ``GetAll`` property dict into a PlayerInfo record."""
+        metadata = props.get("Metadata", {})
+        artist = metadata.get("xesam:artist", "")
+        if isinstance(artist, list):
+            artist = ", ".join(artist)
+        optional = {f: str(metadata.get(_OPTIONAL_FIELDS[f], "")) for f in _get_fields()}
+        return PlayerInfo(
+            player=player,
+            title=str(metadata.get("xesam:title", "")),
+            artist=str(artist),
+            status=str(props.get("PlaybackStatus", "")).lower() or "stopped",
+            length=max(int(metadata.get("mpris:length", 0)), 0) / 1_000_000,
+            position=max(int(props.get("Position", 0)), 0) / 1_000_000,
+            rate=float(props.get("Rate", 1.0)),
+            **optional,
+        )
+
+
+class FakeBackend(Backend):
+    """In-process backend serving a fixed list of players.
+
+    Lets the module run without playerctl or a session bus. When created
+    without arguments, players are read as a JSON list of PlayerInfo
+    fields from the ``MPRIS_ENHANCED_FAKE_PLAYERS`` environment variable.
+
+    Args:
+        players: Players to report. Defaults to the environment variable.
+    """
+
+    name = "fake"
+
+    def __init__(self, players: list[PlayerInfo] | None = None) -> None:
+        if players is None:
+            try:
+                players = [PlayerInfo(**p) for p in json.loads(os.environ.get("MPRIS_ENHANCED_FAKE_PLAYERS", "[]"))]
+            except (ValueError, TypeError):
+                players = []
+        self.players = players
+
+    def collect(self, timeout: float = DEFAULT_TIMEOUT) -> list[PlayerInfo]:
+        return list(self.players)
+
+    def get_position(self, player: str) -> float | None:
+        return next((p.position for p in self.players if p.player.lower() == player.lower()), None)
+
+
+BACKENDS = {
+    "playerctl": PlayerctlBackend,
+    "dbus": DBusBackend,
+    "fake": FakeBackend,
+}
+
+_backend: Backend | None = None
+
+
+def set_backend(backend: Backend | str | None) -> None:
+    """Select the backend used by ``collect_players``.
+
+    Args:
+        backend: A Backend instance, a name from ``BACKENDS``, or None to
+            fall back to the ``MPRIS_ENHANCED_BACKEND`` environment
+            variable (default: playerctl). If the D-Bus backend cannot be
+            loaded, the playerctl backend is used instead.
+    """
+    global _backend
+    if backend is None or isinstance(backend, str):
+        name = backend or os.environ.get("MPRIS_ENHANCED_BACKEND", "playerctl")
+        try:
+            backend = BACKENDS.get(name, PlayerctlBackend)()
+        except ImportError:
+            backend = PlayerctlBackend()
+    _backend = backend
+
+
+def get_backend() -> Backend:
+    """Return the active backend, selecting the default one on first use."""
+    if _backend is None:
+        set_backend(None)
+    return _backend
+
+
+_DEFAULT_CACHE_TTL = 0.5
+
+
+def _state_key(payload: list[dict]) -> list[tuple]:
+    """Reduce a snapshot payload to what Waybar displays (no positions)."""
+    return [(p["player"], p["status"], p["title"], p["artist"]) for p in payload]
 
-    Enumerates all available MPRIS players and selects using:
-      1. Playback status: playing > paused > stopped
-      2. Player type: dedicated music app > browser
+
+def _on_snapshot_change(previous: list[dict], current: list[dict]) -> None:
+    """Push a refresh to Waybar and record history when a player's status or track changed."""
+    if _state_key(previous) != _state_key(current):
+        from . import history
+        from .signals import notify_waybar
+
+        notify_waybar()
+        history.record_change(previous, current)
+
+
+def _snapshot_payload(backend: Backend, timeout: float) -> list[dict]:
+    """Collect ranked players as JSON-serializable dicts for the snapshot."""
+    metrics.record_event("snapshot-refresh")
+    return [asdict(p) for p in rank_players(backend.collect(timeout))]
+
+
+_cache_ttl: float | None = None
+_unresponsive: list[str] = []
+_collected: list[PlayerInfo] = []
+_has_collected = False
+
+
+def set_cache_ttl(ttl: float | None) -> None:
+    """Set how long collected player state is shared between processes.
+
+    Args:
+        ttl: Snapshot lifetime in seconds (0 disables the cache), or None
+            to use ``$MPRIS_ENHANCED_CACHE_TTL`` (default: 0.5).
+    """
+    global _cache_ttl
+    if ttl is None:
+        try:
+            ttl = float(os.environ.get("MPRIS_ENHANCED_CACHE_TTL", _DEFAULT_CACHE_TTL))
+        except ValueError:
+            ttl = _DEFAULT_CACHE_TTL
+    _cache_ttl = ttl
+
+
+def _set_collected(players: list[PlayerInfo], compare: bool) -> None:
+    """Remember a collection for ``get_collected_players``.
+
+    Args:
+        players: The ranked players just collected.
+        compare: Whether to detect changes against the previous
+            collection of this process. Collections through the snapshot
+            cache are compared by the cache instead.
+    """
+    global _unresponsive, _collected, _has_collected
+    if compare and _has_collected:
+        _on_snapshot_change([asdict(p) for p in _collected], [asdict(p) for p in players])
+    _unresponsive = [p.player for p in players if p.status == "unknown"]
+    _collected = players
+    _has_collected = True
+
+
+def collect_players(refresh: bool = False, timeout: float = DEFAULT_TIMEOUT) -> list[PlayerInfo]:
+    """Collect state for every active player from the active backend.
+
+    With the default playerctl backend this is a single
+    ``playerctl --all-players metadata --format`` invocation instead of
+    one ``-l`` call plus several calls per player. The result is shared
+    with concurrent invocations through a snapshot file in the runtime
+    directory, so backends are queried at most about once per cache TTL.
+
+    Args:
+        refresh: Bypass the snapshot and query the backend (e.g. after a
+            change event); the new state is still shared.
+        timeout: Overall time budget for querying the backend.
+
+    Without the snapshot cache (TTL 0), status and track changes are
+    only detected between collections of the same process, i.e. in the
+    resident modes.
 
     Returns:
-        The name of the best player, or None if no players are available.
+        PlayerInfo records ranked best-first (see ``rank_players``), with
+        player names kept verbatim. Empty if no player is active.
     """
-    players_output = run_playerctl(["-l"])
-    if not players_output:
-        return None
+    backend = get_backend()
+    if _cache_ttl is None:
+        set_cache_ttl(None)
+    players = None
+    if _cache_ttl > 0:
+        cache = SnapshotCache(os.path.join(get_runtime_dir(), "snapshot.json"), _cache_ttl, key=":".join((backend.name, *_get_fields())))
+        try:
+            payload = cache.get(lambda: _snapshot_payload(backend, timeout), force=refresh, on_change=_on_snapshot_change)
+            players = [PlayerInfo(**p) for p in payload]
+        except TypeError:
+            pass
+    if players is None:
+        players = rank_players(backend.collect(timeout))
+        _set_collected(players, compare=True)
+    else:
+        _set_collected(players, compare=False)
+    return players
+
+
+async def collect_players_async(refresh: bool = False, timeout: float = DEFAULT_TIMEOUT) -> list[PlayerInfo]:
+    """Asynchronous ``collect_players`` for callers running an event loop.
+
+    Without the snapshot cache the backend is queried natively with
+    ``Backend.collect_async``. Otherwise the cache, whose cross-process
+    lock may block, is consulted from a worker thread.
+    """
+    import asyncio
+
+    if _cache_ttl is None:
+        set_cache_ttl(None)
+    if _cache_ttl > 0:
+        return await asyncio.to_thread(collect_players, refresh, timeout)
 
-    players = [p.strip() for p in players_output.splitlines() if p.strip()]
+    players = rank_players(await get_backend().collect_async(timeout))
+    _set_collected(players, compare=True)
+    return players
+
+
+def resolve_best_player(players: list[PlayerInfo]) -> PlayerInfo | None:
+    """Pick the pinned player if it is active, else the top-ranked one.
+
+    Args:
+        players: Ranked players as returned by ``collect_players``.
+
+    Returns:
+        The selected player, or None if ``players`` is empty. A pin that
+        refers to a player that is no longer active is cleared.
+    """
     if not players:
         return None
 
-    candidates = []
-    for player in players:
-        status = run_playerctl(["--player", player, "status"])
-        if status is None:
-            continue
-        status_p = _STATUS_PRIORITY.get(status.lower(), len(_STATUS_PRIORITY))
-        type_p = _player_type_priority(player)
-        candidates.append((status_p, type_p, player))
+    pinned = get_pinned_player()
+    if pinned:
+        for p in players:
+            if p.player == pinned:
+                return p
+        pin_player(None)  # stale pin — clear it
+
+    return players[0]
+
 
-    if not candidates:
+def get_pin_mtime() -> float | None:
+    """Return the modification time of the pin state file, or None if unset."""
+    try:
+        return os.stat(_PIN_FILE).st_mtime
+    except OSError:
         return None
 
-    candidates.sort(key=lambda x: (x[0], x[1]))
-    active_players = {c[2] for c in candidates}
 
-    pinned = get_pinned_player()
-    if pinned and pinned in active_players:
-        return pinned
-    elif pinned:
-        pin_player(None)  # stale pin — clear it
+def get_all_players() -> list[tuple[str, str]]:
+    """Return list of (player_name, status) for all active players."""
+    return [(p.player, p.status) for p in collect_players()]
+
+
+def select_best_player() -> str | None:
+    """Select the best player based on playback status and player type.
 
-    return candidates[0][2]
+    Collects all available MPRIS players in one batched query and selects using:
+      1. A pinned player, if it is still active
+      2. The configured ranking policy (see ``ranking.py``): playback
+         status, preferred players, bonuses, then dedicated music app >
+         browser
+
+    Returns:
+        The name of the best player, or None if no players are available.
+    """
+    best = resolve_best_player(collect_players())
+    return best.player if best else None
 
 
-def get_player_info() -> PlayerInfo | None:
+def get_player_info(refresh: bool = False) -> PlayerInfo | None:
     """Get current player information from the active MPRIS player.
 
-    Selects the best available player (playing > paused > stopped) and
-    queries playerctl for its metadata including title, artist, and status.
+    Selects the best available player (playing > paused > stopped) from a
+    single batched playerctl query and returns its title, artist, and status.
+
+    Args:
+        refresh: Bypass the shared snapshot (see ``collect_players``).
 
     Returns:
         PlayerInfo object containing current player state, or None if no
@@ -162,17 +1021,13 @@ def get_player_info() -> PlayerInfo | None:
         ...     print(f"{info.artist} - {info.title}")
         Artist Name - Song Title
     """
-    player = select_best_player()
-    if not player:
+    best = resolve_best_player(collect_players(refresh))
+    if not best:
         return None
 
-    title = run_playerctl(["--player", player, "metadata", "--format", "{{title}}"]) or "Unknown"
-    artist = run_playerctl(["--player", player, "metadata", "--format", "{{artist}}"]) or "Unknown"
-    status = run_playerctl(["--player", player, "status"]) or "Stopped"
-
-    return PlayerInfo(
-        player=player.lower(),
-        title=title,
-        artist=artist,
-        status=status.lower(),
+    return replace(
+        best,
+        player=best.player.lower(),
+        title=best.title or "Unknown",
+        artist=best.artist or "Unknown",
     )
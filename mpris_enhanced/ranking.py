@@ -0,0 +1,197 @@
+"""Player ranking policy for MPRIS module.
+
+Decides which player is shown when none is pinned. The policy is read
+once per process from the ``"ranking"`` object of the config file::
+
+    {
+      "ranking": {
+        "preferred": ["spotify", "mpd*"],
+        "ignored": ["kdeconnect*", "re:^chromium\\\\.instance"],
+        "bonus": {"mpv": 1, "firefox*": -1},
+        "recent_first": true
+      }
+    }
+
+Patterns match the player name (the part of the bus name after
+``org.mpris.MediaPlayer2.``, e.g. ``chromium.instance1234``) or its
+base name before the first dot. They are globs, or regular expressions
+when prefixed with ``re:``.
+
+Players are ordered by, in turn: playback status (playing > paused >
+stopped), position in ``preferred``, highest ``bonus``, dedicated
+music apps before browsers, and, with ``recent_first``, the player that
+most recently started playing. Ignored players are never queried.
+"""
+
+__all__ = ["RankingPolicy", "Ranking", "get_policy"]
+
+import os
+import time
+from bisect import bisect_left, insort
+
+from .config import load_config
+from .utils import get_runtime_dir, load_json, save_json
+
+_STATUS_PRIORITY = {"playing": 0, "paused": 1, "stopped": 2}
+
+# Browsers that embed media players — deprioritized vs dedicated music apps.
+_BROWSER_PLAYERS = {"firefox", "chromium", "chrome", "google-chrome", "brave", "opera", "vivaldi", "epiphany"}
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _compile(patterns: list[str]):
+    """Compile glob/``re:`` patterns into one case-insensitive matcher.
+
+    Returns:
+        A function returning True if a player name or its base name
+        matches any pattern, or None if there are no patterns.
+    """
+    if not patterns:
+        return None
+    import fnmatch
+    import re
+
+    parts = [p[3:] if p.startswith("re:") else fnmatch.translate(p) for p in patterns]
+    regex = re.compile("|".join(f"(?:{part})" for part in parts), re.IGNORECASE)
+    return lambda name: bool(regex.match(name) or regex.match(name.split(".")[0]))
+
+
+class RankingPolicy:
+    """Compiled ranking policy.
+
+    All patterns are compiled into one regex per setting, and the part
+    of the sort key that depends only on the player name is computed
+    once per name, so ranking a player costs a dict lookup.
+
+    Args:
+        config: The ``"ranking"`` object of the config file.
+    """
+
+    def __init__(self, config: dict | None = None) -> None:
+        config = config if isinstance(config, dict) else {}
+        preferred = [str(p) for p in config.get("preferred", [])]
+        ignored = [str(p) for p in config.get("ignored", [])]
+        bonus = config.get("bonus", {})
+        bonus = bonus if isinstance(bonus, dict) else {}
+
+        self._preferred = [_compile([p]) for p in preferred]
+        self._ignored = _compile(ignored)
+        self._bonus = []
+        for pattern, value in bonus.items():
+            try:
+                self._bonus.append((_compile([str(pattern)]), float(value)))
+            except (TypeError, ValueError):
+                continue
+        self.recent_first = bool(config.get("recent_first", False))
+        # Literal names can be excluded by playerctl itself (--ignore-player)
+        self.ignored_names = [p for p in ignored if not p.startswith("re:") and not _GLOB_CHARS & set(p)]
+        self._static: dict[str, tuple] = {}
+        self._ignored_cache: dict[str, bool] = {}
+
+    def is_ignored(self, player: str) -> bool:
+        """Return whether a player must never be queried or shown."""
+        if self._ignored is None:
+            return False
+        ignored = self._ignored_cache.get(player)
+        if ignored is None:
+            ignored = self._ignored_cache[player] = self._ignored(player)
+        return ignored
+
+    def _static_key(self, player: str) -> tuple:
+        """Return the part of the sort key that depends only on the name."""
+        key = self._static.get(player)
+        if key is None:
+            preferred = next((i for i, match in enumerate(self._preferred) if match(player)), len(self._preferred))
+            bonus = sum(value for match, value in self._bonus if match(player))
+            browser = 1 if player.lower().split(".")[0] in _BROWSER_PLAYERS else 0
+            key = self._static[player] = (preferred, -bonus, browser)
+        return key
+
+    def key(self, player: str, status: str, playing_since: float = 0.0) -> tuple:
+        """Return the sort key of a player; lower sorts first.
+
+        Args:
+            player: Player name as reported by the backend.
+            status: Playback status ('playing', 'paused', ...).
+            playing_since: When the player last started playing (only
+                used with ``recent_first``).
+        """
+        priority = _STATUS_PRIORITY.get(status, len(_STATUS_PRIORITY))
+        recency = -playing_since if self.recent_first else 0.0
+        return (priority, *self._static_key(player), recency, player)
+
+
+class Ranking:
+    """Players kept in policy order and updated incrementally.
+
+    Resident processes keep one instance across collections: only the
+    players whose state changed are removed and re-inserted at their
+    new position, instead of re-sorting every player.
+
+    Args:
+        policy: The compiled ranking policy.
+    """
+
+    def __init__(self, policy: RankingPolicy) -> None:
+        self.policy = policy
+        self._entries: list[tuple] = []
+        self._by_name: dict[str, tuple] = {}
+        self._since_path = os.path.join(get_runtime_dir(), "playing-since.json")
+
+    def _playing_since(self, players: list) -> dict[str, float]:
+        """Update and return when each player last started playing.
+
+        Kept in a state file so the order is the same for every process.
+        """
+        since = load_json(self._since_path, {})
+        updated = {}
+        now = time.time()
+        for p in players:
+            if p.status == "playing":
+                updated[p.player] = since.get(p.player) or now
+        if updated != since:
+            save_json(self._since_path, updated)
+        return updated
+
+    def _remove(self, name: str) -> None:
+        entry = self._by_name.pop(name)
+        del self._entries[bisect_left(self._entries, entry[0], key=lambda e: e[0])]
+
+    def update(self, players: list) -> list:
+        """Bring the ranking up to date with newly collected state.
+
+        Args:
+            players: PlayerInfo records of every active player, in any
+                order.
+
+        Returns:
+            The players that are not ignored, best first.
+        """
+        players = [p for p in players if not self.policy.is_ignored(p.player)]
+        since = self._playing_since(players) if self.policy.recent_first else {}
+
+        current = {p.player: p for p in players}
+        for name in [n for n in self._by_name if n not in current]:
+            self._remove(name)
+        for name, info in current.items():
+            entry = self._by_name.get(name)
+            if entry is not None and entry[1] == info:
+                continue
+            if entry is not None:
+                self._remove(name)
+            entry = (self.policy.key(name, info.status, since.get(name, 0.0)), info)
+            insort(self._entries, entry, key=lambda e: e[0])
+            self._by_name[name] = entry
+        return [info for _, info in self._entries]
+
+
+_policy: RankingPolicy | None = None
+
+
+def get_policy() -> RankingPolicy:
+    """Return the ranking policy from the config file, compiled once."""
+    global _policy
+    if _policy is None:
+        _policy = RankingPolicy(load_config().get("ranking"))
+    return _policy
@@ -0,0 +1,59 @@
+"""Memoized rendering for resident modes.
+
+The server and follow mode render the same few components over and
+over, mostly from an unchanged player state. ``RenderCache`` keys each
+rendered output by the component, its arguments, the PlayerInfo fields
+it declares and its current animation frame, and keeps the output
+already encoded as a JSON line, so an unchanged frame costs one dict
+lookup instead of a render, Pango escaping and ``json.dumps``.
+"""
+
+__all__ = ["RenderCache", "encode_output"]
+
+import json
+
+from . import metrics
+from .components.base import Component, ComponentOutput
+from .playerctl import PlayerInfo
+
+
+def encode_output(output: ComponentOutput) -> bytes:
+    """Encode component output as one newline-terminated JSON line."""
+    return (json.dumps(output.to_dict()) + "\n").encode()
+
+
+class RenderCache:
+    """Encoded component output keyed by everything it depends on.
+
+    Entries are evicted oldest first once ``capacity`` is reached, so a
+    lookup never has to reorder anything.
+
+    Args:
+        capacity: Maximum number of encoded outputs kept. Scrolling
+            titles need one entry per scroll position.
+    """
+
+    def __init__(self, capacity: int = 512) -> None:
+        self.capacity = capacity
+        self._entries: dict[tuple, bytes] = {}
+
+    def render(self, component: Component, info: PlayerInfo | None) -> bytes:
+        """Return the encoded output of a component for the given state.
+
+        Calls ``component.frame()`` exactly once, so animations advance
+        as they would with a plain ``render()``.
+        """
+        frame = component.frame(info)
+        values = None if info is None else tuple(getattr(info, name) for name in component.fields)
+        key = (type(component), component.args, values, frame)
+
+        data = self._entries.get(key)
+        if data is not None:
+            metrics.record_event("render-cache-hit")
+            return data
+
+        data = encode_output(component.render_frame(info, frame))
+        if len(self._entries) >= self.capacity:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = data
+        return data
@@ -0,0 +1,146 @@
+"""Resident server sharing one player state between all components.
+
+The ``serve`` subcommand keeps a single ``PlayerInfo`` state and answers
+render requests from the thin client (see ``client.py``) over a Unix
+domain socket under ``$XDG_RUNTIME_DIR``. Players are enumerated and the
+pin file is read at most once per refresh, no matter how many Waybar
+modules ask.
+"""
+
+__all__ = ["serve"]
+
+import contextlib
+import io
+import os
+import signal
+import socket
+import socketserver
+import sys
+import time
+from collections.abc import Callable
+
+from . import metrics
+from .client import REFRESH_REQUEST, get_socket_path
+from .components.base import Component, ComponentArgs
+from .playerctl import PlayerInfo, get_player_info
+from .render import RenderCache
+
+# Seconds a collected state is reused before players are queried again.
+_STATE_TTL = 0.5
+
+
+class _RenderServer(socketserver.UnixStreamServer):
+    """Unix socket server holding the shared player state."""
+
+    def __init__(self, path: str, load_component: Callable[[str], type[Component]], parse_args) -> None:
+        self.load_component = load_component
+        self.parse_args = parse_args
+        self.instances: dict[tuple, Component] = {}
+        self.render_cache = RenderCache()
+        self.info: PlayerInfo | None = None
+        self.collected_at = float("-inf")
+        super().__init__(path, _RenderHandler)
+
+    def get_info(self) -> PlayerInfo | None:
+        """Return the shared state, refreshing it if older than the TTL."""
+        now = time.monotonic()
+        if now - self.collected_at >= _STATE_TTL:
+            self.info = get_player_info()
+            self.collected_at = now
+        return self.info
+
+    def render(self, argv: list[str]) -> bytes:
+        """Render the component requested by a client command line.
+
+        Returns:
+            The encoded JSON line, or empty bytes if the request is not a
+            plain component render (the client then runs it directly).
+        """
+        if argv == [REFRESH_REQUEST]:
+            self.collected_at = float("-inf")
+            return b"ok\n"
+
+        try:
+            # Usage errors are reported by the client's own direct run
+            with contextlib.redirect_stderr(io.StringIO()):
+                args = self.parse_args(argv)
+        except SystemExit:
+            return b""
+        if args.follow:
+            return b""
+
+        component_args = ComponentArgs(
+            scroll=args.scroll,
+            max_length=args.max_length,
+            scroll_speed=args.scroll_speed,
+        )
+        key = (args.component, component_args)
+        component = self.instances.get(key)
+        if component is None:
+            try:
+                component = self.load_component(args.component)(component_args)
+            except KeyError:
+                return b""
+            self.instances[key] = component
+
+        metrics.record_invocation(args.component)
+        info = self.get_info()
+        start = time.perf_counter()
+        data = self.render_cache.render(component, info)
+        metrics.record_render(args.component, time.perf_counter() - start)
+        return data
+
+
+class _RenderHandler(socketserver.StreamRequestHandler):
+    """Handle one NUL-separated command line and reply with its output."""
+
+    timeout = 1.0
+
+    def handle(self) -> None:
+        data = self.rfile.read()
+        argv = data.decode().split("\0") if data else []
+        with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+            self.wfile.write(self.server.render(argv))
+
+
+def _socket_in_use(path: str) -> bool:
+    """Return True if another server is accepting connections on path."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+        return True
+    except OSError:
+        return False
+
+
+def serve(load_component: Callable[[str], type[Component]], parse_args) -> None:
+    """Run the render server until interrupted.
+
+    Args:
+        load_component: Returns the component class for a name clients
+            may request, raising KeyError for unknown names.
+        parse_args: Function parsing a client command line into the
+            same namespace as ``main.parse_args``.
+
+    Exits with an error message if $XDG_RUNTIME_DIR is unset or another
+    server is already running.
+    """
+    path = get_socket_path()
+    if path is None:
+        sys.exit("serve: $XDG_RUNTIME_DIR is not set")
+    if os.path.exists(path):
+        if _socket_in_use(path):
+            sys.exit(f"serve: already running on {path}")
+        os.unlink(path)
+
+    server = _RenderServer(path, load_component, parse_args)
+    os.chmod(path, 0o600)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(path)
@@ -0,0 +1,70 @@
+"""Push refreshes to Waybar through realtime signals.
+
+A Waybar custom module with ``"signal": N`` re-runs its ``exec`` when
+Waybar receives ``SIGRTMIN+N``. When the module notices a status or
+track change, or performs a control action, it signals every running
+Waybar instance so that modules can use a long ``interval`` (or
+``"once"``) without becoming stale.
+"""
+
+__all__ = ["find_waybar_pids", "notify_waybar"]
+
+import os
+import signal
+
+from .config import get_signals
+
+# Process names Waybar runs under (the second is used by Nix wrappers).
+_WAYBAR_NAMES = {"waybar", ".waybar-wrapped"}
+
+
+def find_waybar_pids() -> list[int]:
+    """Return the PIDs of the current user's running Waybar processes."""
+    uid = os.getuid()
+    pids = []
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return pids
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/comm") as f:
+                name = f.read().strip()
+            if name in _WAYBAR_NAMES and os.stat(f"/proc/{entry}").st_uid == uid:
+                pids.append(int(entry))
+        except OSError:
+            continue
+    return pids
+
+
+def notify_waybar(components: list[str] | None = None, pids: list[int] | None = None) -> int:
+    """Send the configured refresh signals to Waybar.
+
+    Args:
+        components: Components to refresh. Defaults to every component
+            with a configured signal.
+        pids: Processes to signal. Defaults to all running Waybar
+            instances (see ``find_waybar_pids``).
+
+    Returns:
+        The number of signals delivered. Nothing is sent, and no process
+        lookup is done, when no signals are configured.
+    """
+    configured = get_signals()
+    if components is not None:
+        configured = {c: n for c, n in configured.items() if c in components}
+    offsets = {n for n in configured.values() if 1 <= n <= signal.SIGRTMAX - signal.SIGRTMIN}
+    if not offsets:
+        return 0
+
+    sent = 0
+    for pid in find_waybar_pids() if pids is None else pids:
+        for offset in sorted(offsets):
+            try:
+                os.kill(pid, signal.SIGRTMIN + offset)
+                sent += 1
+            except OSError:
+                continue
+    return sent
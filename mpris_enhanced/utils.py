@@ -5,15 +5,115 @@ text truncation, and scrolling text animation with state persistence.
 """
 
 __all__ = [
+    "display_width",
     "truncate_text",
-    "get_scroll_state_file",
+    "ScrollStore",
+    "get_scroll_store",
     "get_scrolling_text",
+    "get_scroll_position",
+    "scroll_window",
     "escape_pango",
+    "format_time",
+    "get_runtime_dir",
+    "get_state_dir",
+    "get_cache_dir",
+    "load_json",
+    "save_json",
 ]
 
-import hashlib
+import contextlib
+import json
 import os
-import tempfile
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+
+
+def get_runtime_dir() -> str:
+    """Return the per-user directory for sockets and shared state.
+
+    Uses ``$XDG_RUNTIME_DIR/waybar-mpris-enhanced``, falling back to a
+    per-user directory in the system temp directory. The directory is
+    created on first use.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        path = os.path.join(runtime_dir, "waybar-mpris-enhanced")
+    else:
+        import tempfile
+
+        path = os.path.join(tempfile.gettempdir(), f"waybar-mpris-enhanced-{os.getuid()}")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
+
+
+def get_state_dir() -> str:
+    """Return the per-user directory for persistent state (stats, history).
+
+    Uses ``$XDG_STATE_HOME/waybar-mpris-enhanced`` (default
+    ``~/.local/state``). The directory is created on first use.
+    """
+    state_home = os.environ.get("XDG_STATE_HOME") or os.path.expanduser("~/.local/state")
+    path = os.path.join(state_home, "waybar-mpris-enhanced")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_cache_dir() -> str:
+    """Return the per-user directory for disposable caches (thumbnails).
+
+    Uses ``$XDG_CACHE_HOME/waybar-mpris-enhanced`` (default
+    ``~/.cache``). The directory is created on first use.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    path = os.path.join(cache_home, "waybar-mpris-enhanced")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def load_json(path: str, default=None):
+    """Return the JSON value stored in a state file.
+
+    Returns:
+        The parsed value, or ``default`` if the file is missing or not
+        valid JSON.
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path: str, value) -> bool:
+    """Atomically replace a state file with a JSON value.
+
+    The value is written to a per-process temporary file that is then
+    renamed over ``path``, so concurrent readers see either the old or
+    the new content.
+
+    Returns:
+        True if the file was written.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(value, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        return False
+    return True
+
+
+_PANGO_ESCAPES = str.maketrans(
+    {
+        "&": "&amp;",
+        "<": "&lt;",
+        ">": "&gt;",
+        "'": "&apos;",
+        '"': "&quot;",
+    }
+)
 
 
 def escape_pango(text: str) -> str:
@@ -30,65 +130,282 @@ def escape_pango(text: str) -> str:
         >>> escape_pango("Rock & Roll <3")
         'Rock &amp; Roll &lt;3'
     """
-    return (
-        text.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace("'", "&apos;")
-        .replace('"', "&quot;")
-    )
+    return text.translate(_PANGO_ESCAPES)
+
+
+def format_time(seconds: float) -> str:
+    """Format seconds as m:ss, or h:mm:ss for an hour or more."""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+_ZWJ = "\u200d"
+
+
+def _is_regional_indicator(char: str) -> bool:
+    return "\U0001f1e6" <= char <= "\U0001f1ff"
+
+
+def _extends_cluster(cluster: str, char: str) -> bool:
+    """Return whether char continues the grapheme cluster before it."""
+    import unicodedata
+
+    if cluster[-1] == _ZWJ or char == _ZWJ:
+        return True
+    if (
+        "\ufe00" <= char <= "\ufe0f"  # variation selectors
+        or "\U0001f3fb" <= char <= "\U0001f3ff"  # skin tone modifiers
+        or "\U000e0020" <= char <= "\U000e007f"  # emoji tag sequences
+        or "\u1160" <= char <= "\u11ff"  # Hangul medial/final jamo
+    ):
+        return True
+    if _is_regional_indicator(char):
+        return len(cluster) == 1 and _is_regional_indicator(cluster)
+    return unicodedata.category(char) in ("Mn", "Me", "Mc")
+
+
+def _cluster_width(cluster: str) -> int:
+    """Return the display cells a grapheme cluster occupies."""
+    import unicodedata
+
+    base = cluster[0]
+    if unicodedata.category(base) in ("Mn", "Me", "Cc", "Cf"):
+        return 0
+    if (
+        unicodedata.east_asian_width(base) in ("W", "F")
+        or "\ufe0f" in cluster
+        or _is_regional_indicator(base)
+    ):
+        return 2
+    return 1
+
+
+@lru_cache(maxsize=64)
+def _text_index(text: str) -> tuple[tuple[str, ...], tuple[int, ...]]:
+    """Split text into grapheme clusters and their cumulative widths.
+
+    Computed once per title and cached, so truncation and every scroll
+    frame only bisect the index and join the visible clusters.
+
+    Returns:
+        The clusters, and for each cluster the display cell at which it
+        ends (so the last entry is the width of the whole text).
+    """
+    if text.isascii():
+        return tuple(text), tuple(range(1, len(text) + 1))
+
+    clusters: list[str] = []
+    for char in text:
+        if clusters and _extends_cluster(clusters[-1], char):
+            clusters[-1] += char
+        else:
+            clusters.append(char)
+
+    ends = []
+    width = 0
+    for cluster in clusters:
+        width += _cluster_width(cluster)
+        ends.append(width)
+    return tuple(clusters), tuple(ends)
+
+
+def display_width(text: str) -> int:
+    """Return the number of display cells text occupies.
+
+    Wide (CJK) characters and emoji count as two cells, combining marks
+    and other zero-width characters as none.
+
+    Example:
+        >>> display_width("東京 Tokyo")
+        10
+    """
+    if text.isascii():
+        return len(text)
+    ends = _text_index(text)[1]
+    return ends[-1] if ends else 0
 
 
 def truncate_text(text: str, max_len: int) -> str:
-    """Truncate text to max length with ellipsis.
+    """Truncate text to max display width with ellipsis.
+
+    Text is measured in display cells (see ``display_width``) and only
+    cut between grapheme clusters, so wide characters, emoji sequences
+    and combining marks are never split.
 
     Args:
         text: Input text to truncate.
-        max_len: Maximum length of output string (including ellipsis).
+        max_len: Maximum display width of the output (including ellipsis).
 
     Returns:
-        Original text if shorter than max_len, otherwise truncated text
+        Original text if it fits within max_len, otherwise truncated text
         with a trailing ellipsis character (…).
 
     Example:
         >>> truncate_text("Very Long Song Title", 10)
         'Very Long…'
     """
-    if len(text) <= max_len:
+    if text.isascii():
+        if len(text) <= max_len:
+            return text
+        return text[: max_len - 1] + "…"
+
+    clusters, ends = _text_index(text)
+    if not ends or ends[-1] <= max_len:
         return text
-    return text[: max_len - 1] + "…"
+    return "".join(clusters[: bisect_right(ends, max_len - 1)]) + "…"
 
 
-def get_scroll_state_file(text: str) -> str:
-    """Get the path to the scroll state file for the given text.
+class ScrollStore:
+    """Scroll positions of recently seen titles, kept in one state file.
 
-    Creates a unique temporary file path based on the text content hash,
-    used to persist scroll position across invocations.
+    Positions are stored as a JSON list of ``[title, position]`` pairs,
+    least recently used first. Only the ``capacity`` most recent titles
+    are kept, so the file stays small however many tracks are played.
+    The file is re-read only when another process has modified it, and
+    written only when a position or the recency order actually changes.
 
     Args:
-        text: The text being scrolled (used to generate unique hash).
+        path: Path of the state file.
+        capacity: Maximum number of titles to remember.
+    """
+
+    def __init__(self, path: str, capacity: int = 32) -> None:
+        self.path = path
+        self.capacity = capacity
+        self._positions: OrderedDict[str, int] = OrderedDict()
+        self._mtime: float | None = None
+
+    def _load(self) -> None:
+        """Reload positions if the state file changed since the last read."""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            entries = load_json(self.path, [])
+            self._positions = OrderedDict((str(t), int(p)) for t, p in entries)
+        except (ValueError, TypeError):
+            self._positions = OrderedDict()
+        self._mtime = mtime
+
+    def _save(self) -> None:
+        """Atomically write all positions to the state file."""
+        if save_json(self.path, list(self._positions.items())):
+            with contextlib.suppress(OSError):
+                self._mtime = os.stat(self.path).st_mtime
+
+    def get(self, text: str) -> int:
+        """Return the stored position for a title (0 if unknown)."""
+        self._load()
+        return self._positions.get(text, 0)
+
+    def set(self, text: str, position: int) -> None:
+        """Store a title's position, marking it most recently used."""
+        self._load()
+        if self._positions.get(text) == position and next(reversed(self._positions)) == text:
+            return
+        self._positions[text] = position
+        self._positions.move_to_end(text)
+        while len(self._positions) > self.capacity:
+            self._positions.popitem(last=False)
+        self._save()
+
+
+# Each character is a single-width cluster of its own, so separated
+# ASCII titles scroll by plain slicing
+_SCROLL_SEPARATOR = "   ·   "
+
+_scroll_store: ScrollStore | None = None
+
+
+def get_scroll_store() -> ScrollStore:
+    """Return the shared scroll position store in the runtime directory."""
+    global _scroll_store
+    if _scroll_store is None:
+        _scroll_store = ScrollStore(os.path.join(get_runtime_dir(), "scroll.json"))
+    return _scroll_store
+
+
+def get_scroll_position(text: str, max_len: int, scroll_speed: int = 1, advance: bool = True) -> int | None:
+    """Return the scroll position to display for a title.
+
+    The position is read from the shared ``ScrollStore`` and, if
+    ``advance`` is set, the next position is stored for the following
+    call.
+
+    Args:
+        text: The full text to scroll.
+        max_len: Display width of the visible window.
+        scroll_speed: Number of grapheme clusters to advance per call
+            (default: 1).
+        advance: Whether to move the window for the next call.
 
     Returns:
-        Absolute path to the scroll state file in the system temp directory.
+        The offset of the visible window in grapheme clusters, or None
+        if the text fits within max_len display cells and does not
+        scroll.
     """
-    text_hash = hashlib.sha256(text.encode()).hexdigest()[:8]
-    return os.path.join(
-        tempfile.gettempdir(),
-        f"waybar-mpris-scroll-{text_hash}",
-    )
+    if display_width(text) <= max_len:
+        return None
+
+    total_len = len(_text_index(text + _SCROLL_SEPARATOR)[0])
+    store = get_scroll_store()
+    position = store.get(text) % total_len
+    if advance:
+        store.set(text, (position + scroll_speed) % total_len)
+    return position
+
+
+def scroll_window(text: str, max_len: int, position: int | None) -> str:
+    """Return the max_len cells wide window of scrolling text at a position.
+
+    The window holds whole grapheme clusters and is padded with spaces
+    when a wide character does not fit at its end, so every frame has
+    the same display width and the bar does not jitter.
 
+    Args:
+        text: The full text to scroll.
+        max_len: Display width of the visible window.
+        position: Offset as returned by ``get_scroll_position``; None
+            returns the text unchanged.
 
-def get_scrolling_text(text: str, max_len: int, scroll_speed: int = 1) -> str:
+    Example:
+        >>> scroll_window("Long scrolling title", 10, 1)
+        'ong scroll'
+    """
+    if position is None:
+        return text
+    # Add separator for continuous scrolling effect; the window may wrap
+    # around, so slice from the padded text repeated twice
+    padded_text = text + _SCROLL_SEPARATOR
+    if text.isascii():
+        return (padded_text + padded_text)[position : position + max_len]
+
+    clusters, ends = _text_index(padded_text + padded_text)
+    start = ends[position - 1] if position else 0
+    stop = bisect_right(ends, start + max_len, lo=position)
+    width = ends[stop - 1] - start if stop > position else 0
+    return "".join(clusters[position:stop]) + " " * (max_len - width)
+
+
+def get_scrolling_text(text: str, max_len: int, scroll_speed: int = 1, advance: bool = True) -> str:
     """Get scrolling text with state persistence.
 
     Returns a sliding window of text that shifts on each call, creating
-    a marquee/scrolling effect. The scroll position is persisted in a
-    temporary file so it continues smoothly across invocations.
+    a marquee/scrolling effect. The scroll position is persisted in the
+    shared ``ScrollStore`` so it continues smoothly across invocations.
 
     Args:
         text: The full text to scroll.
         max_len: Maximum length of the visible window.
         scroll_speed: Number of characters to advance per call (default: 1).
+        advance: Whether to move the window for the next call. When False
+            (e.g. playback is paused) the same frame is returned and no
+            state is written.
 
     Returns:
         A max_len substring of the text, shifted based on the current
@@ -102,35 +419,4 @@ def get_scrolling_text(text: str, max_len: int, scroll_speed: int = 1) -> str:
         >>> get_scrolling_text("Long scrolling title", 10, 1)
         'ong scroll'
     """
-    if len(text) <= max_len:
-        return text
-
-    # Add separator for continuous scrolling effect
-    padded_text = text + "   ·   "
-    total_len = len(padded_text)
-
-    state_file = get_scroll_state_file(text)
-
-    # Read current position
-    try:
-        with open(state_file) as f:
-            position = int(f.read().strip())
-    except (FileNotFoundError, ValueError):
-        position = 0
-
-    # Calculate the visible window
-    visible_text = "".join(
-        padded_text[(position + i) % total_len] for i in range(max_len)
-    )
-
-    # Update position for next call (atomic write to prevent race conditions)
-    new_position = (position + scroll_speed) % total_len
-    try:
-        tmp_file = state_file + ".tmp"
-        with open(tmp_file, "w") as f:
-            f.write(str(new_position))
-        os.replace(tmp_file, state_file)
-    except OSError:
-        pass
-
-    return visible_text
+    return scroll_window(text, max_len, get_scroll_position(text, max_len, scroll_speed, advance))